@@ -1,4 +1,5 @@
 from ezquiz.apigame import APIGame
 from ezquiz.ezquiz import Q
+from ezquiz.loading import BankError
 
-__all__ = ["Q", "APIGame"]
+__all__ = ["Q", "APIGame", "BankError"]
@@ -31,16 +31,95 @@ Example:
     >>> # Visit http://localhost:8000/ for the lobby
 """
 
+import json
+import secrets
 from pathlib import Path
 from random import choice
+from typing import Callable, Iterable, Iterator, Literal
 
 import uvicorn
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.requests import ClientDisconnect
 
 from ezquiz.ezquiz import Q
+from ezquiz.grading import agrade_many, grade, grade_many, iter_json_rows
+from ezquiz.loading import BankReport, load_quizzes
+from ezquiz.media import MediaStore
+from ezquiz.offline import build_bank
+from ezquiz.profiling import Profiler
+from ezquiz.timers import TimedSessions
+
+# Bulk grading results held back per request until the body is fully read
+_BULK_HOLD_BYTES = 32 << 20
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse that may keep reading the request body while sending.
+
+    The stock StreamingResponse listens for client disconnects by calling
+    `receive()` concurrently, which would swallow request body chunks that
+    the body iterator has not consumed yet.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+
+def _as_browser_json(value):
+    """Return a JSON value as it comes back after a trip through JavaScript.
+
+    JavaScript has a single number type, so integral floats come back as
+    integers. Integers beyond 2**53 lose precision there and are not
+    supported as seeds of timed quizzes.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, list):
+        return [_as_browser_json(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _as_browser_json(v) for k, v in value.items()}
+    return value
+
+
+def _question_key(category, seed) -> str:
+    """Identify a question by its category and seed, as they round-trip JSON."""
+    seed = _as_browser_json(json.loads(json.dumps(seed)))
+    return json.dumps([category, seed], sort_keys=True)
+
+
+def _check_session_fields(data: dict, *names: str) -> None:
+    """Reject timed quiz requests whose session fields are not strings."""
+    for name in names:
+        if not isinstance(data.get(name), (str, type(None))):
+            raise HTTPException(status_code=400, detail=f"{name} must be a string")
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag.
+
+    Handles "*", lists of tags and weak tags (W/"..."), which are compared
+    by their opaque value as RFC 9110 requires for If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
 
 
 class APIGame:
@@ -54,7 +133,12 @@ class APIGame:
 
     Attributes:
         quizzes: Dictionary mapping subpaths to quiz configurations.
-                Each entry contains "title" and "qs" (questions dict).
+                Each entry contains "title", "qs" (questions dict) and
+                the per-quiz options passed to `add_quiz`.
+        profiler: Profiler for the Q functions of the registered quizzes.
+                Controlled over HTTP under /_admin/ if an admin token is set.
+        media: Store of image and audio files referenced by questions,
+                served under /media/.
 
     Example:
         >>> game = APIGame()
@@ -70,11 +154,31 @@ class APIGame:
         >>> game.start(host="localhost", port=8000)
     """
 
-    def __init__(self) -> None:
-        """Initialize an empty quiz server."""
-        self.quizzes = {}  # subpath -> {"title": str, "qs": dict[str, Q]}
+    def __init__(self, *, admin_token: str | None = None) -> None:
+        """Initialize an empty quiz server.
 
-    def add_quiz(self, subpath: str, title: str, qs: dict[str, Q]) -> None:
+        Args:
+            admin_token: Enables the admin API (profiling) under /_admin/.
+                    Requests must send `Authorization: Bearer <admin_token>`.
+                    The admin API is not served if no token is given.
+        """
+        self.quizzes = {}  # subpath -> {"title": str, "qs": dict[str, Q], ...}
+        self.admin_token = admin_token
+        self.profiler = Profiler()
+        self.media = MediaStore()
+
+    def add_quiz(
+        self,
+        subpath: str,
+        title: str,
+        qs: dict[str, Q] | Callable[[], dict[str, Q]],
+        *,
+        offline: bool = False,
+        hash_answers: bool = True,
+        prefetch: bool = False,
+        time_limit: float | None = None,
+        session_limit: float | None = None,
+    ) -> None:
         """Add a quiz at the given subpath.
 
         The quiz will be accessible at `/{subpath}/` and will appear in the lobby.
@@ -83,10 +187,27 @@ class APIGame:
             subpath: URL path for this quiz (e.g., "math", "spanish").
                     Leading/trailing slashes are automatically stripped.
             title: Display title for the quiz shown in the lobby and quiz page.
-            qs: Dictionary mapping category names to Q question objects.
+            qs: Dictionary mapping category names to Q question objects, or
+                a function returning one. Functions are called by `prepare`,
+                in parallel with the other quizzes' loaders.
+            offline: Ship all categories to the browser and grade answers
+                    client-side. Every category must be built with
+                    `Q.from_dict`. Results are synced back in batches.
+            hash_answers: In offline mode, send answers as salted hashes
+                    instead of plain text. The UI then cannot show a diff
+                    against the correct answer, and the quiz has no
+                    server-side grading routes, which would reveal it. Not possible with "choice"
+                    categories, whose options give the answer away.
+            prefetch: Let the UI fetch the next question while the current
+                    one is being answered, and start loading its media.
+            time_limit: Seconds allowed to answer each question. Enforced by
+                    the server: late answers are rejected, not graded.
+            session_limit: Seconds a quiz session lasts, from its first
+                    question. Afterwards the quiz is complete.
 
         Raises:
-            ValueError: If subpath is empty after stripping slashes.
+            ValueError: If subpath is empty after stripping slashes, or if
+                    time limits are combined with offline or prefetch.
 
         Example:
             >>> game = APIGame()
@@ -109,7 +230,106 @@ class APIGame:
         subpath = subpath.strip("/")
         if not subpath:
             raise ValueError("subpath cannot be empty")
-        self.quizzes[subpath] = {"title": title, "qs": qs}
+        if time_limit is not None or session_limit is not None:
+            # Offline answers are graded in the browser, and a prefetched
+            # question would start its clock before it is shown
+            if offline or prefetch:
+                raise ValueError("time limits cannot be used with offline or prefetch")
+        self.quizzes[subpath] = {
+            "title": title,
+            "qs": qs,
+            "offline": offline,
+            "hash_answers": hash_answers,
+            "prefetch": prefetch,
+            "time_limit": time_limit,
+            "session_limit": session_limit,
+            "loaded": False,
+        }
+
+    def prepare(
+        self,
+        *,
+        max_workers: int | None = None,
+        warmup: int = 3,
+        executor: Literal["thread", "process"] = "thread",
+    ) -> list[BankReport]:
+        """Load, validate and warm up all quizzes not prepared yet.
+
+        Called by `start` before the server accepts traffic. Call it
+        yourself to use non-default options or to check banks in a test.
+
+        Loaders passed to `add_quiz` run in parallel. Every category is then
+        checked (e.g. `from_dict` answers must be strings) and a few
+        questions are generated and graded to catch failing functions.
+
+        Args:
+            max_workers: Size of the worker pools.
+            warmup: Number of questions generated and graded per category.
+            executor: Run loaders on "thread"s or in worker "process"es.
+                    Process loaders must be module-level functions returning
+                    picklable Q objects, such as `Q.from_dict` banks.
+
+        Returns:
+            Load time, warm-up time and approximate memory per category.
+
+        Raises:
+            BankError: Listing every problem found, if any.
+
+        Example:
+            >>> game.add_quiz("geography", "World Geography", load_capitals)
+            >>> for report in game.prepare(executor="process"):
+            ...     print(report)
+        """
+        return load_quizzes(
+            self.quizzes, max_workers=max_workers, warmup=warmup, executor=executor
+        )
+
+    def grade_many(
+        self,
+        subpath: str,
+        rows: Iterable,
+        *,
+        batch_size: int = 256,
+        max_workers: int | None = None,
+    ) -> Iterator[dict]:
+        """Grade many answers of a quiz without going through HTTP.
+
+        Rows are grouped by category and graded in batches on a thread pool.
+        Results are yielded as soon as their batch is done, so they are not
+        in input order; use the "index" key to match them to their rows.
+
+        Args:
+            subpath: Subpath of the quiz the answers belong to.
+            rows: Iterable of `{"category", "seed", "answer"}` dicts or
+                  `(category, seed, answer)` tuples. Consumed lazily.
+            batch_size: Number of rows of the same category per task.
+            max_workers: Number of grading threads.
+
+        Yields:
+            Result dicts like the submit API response, plus "index" and
+            "category". Rows that could not be graded have an "error" key.
+
+        Raises:
+            KeyError: If no quiz is registered at subpath.
+            ValueError: If the quiz is timed; its answers are only accepted
+                    within a session, through the submit API.
+            BankError: If a quiz has not been prepared yet and fails to.
+
+        Example:
+            >>> rows = [("capitals", "Capital of France?", "Paris")]
+            >>> for result in game.grade_many("geography", rows):
+            ...     print(result["index"], result["correct"])
+            0 True
+        """
+        quiz_data = self.quizzes[subpath.strip("/")]
+        if (
+            quiz_data["time_limit"] is not None
+            or quiz_data["session_limit"] is not None
+        ):
+            raise ValueError("timed quizzes cannot be graded in bulk")
+        self.prepare()
+        qs = quiz_data["qs"]
+        return grade_many(qs, rows, batch_size=batch_size, max_workers=max_workers)
 
     def start(
         self,
@@ -120,11 +340,15 @@ class APIGame:
     ) -> None:
         """Start the FastAPI server and serve all registered quizzes.
 
-        This method blocks until the server is stopped. The server provides:
+        This method blocks until the server is stopped. Quizzes are prepared
+        first (see `prepare`), so invalid banks stop the server from starting.
+        The server provides:
         - A lobby page at the root URL listing all quizzes
         - Individual quiz pages at /{subpath}/
         - Static assets (JS, CSS) for the web interface
-        - REST API endpoints for fetching questions and submitting answers
+        - Media files registered in `self.media` at /media/
+        - REST API endpoints for fetching questions and submitting answers,
+          one at a time or in bulk
 
         Args:
             host: Hostname to bind the server to (e.g., "localhost", "0.0.0.0").
@@ -141,6 +365,9 @@ class APIGame:
             >>> # Start on all interfaces
             >>> game.start(host="0.0.0.0", port=8080)
         """
+        for report in self.prepare():
+            print(report)
+
         app = FastAPI(**fastapi_kw)
         app.mount(
             "/static",
@@ -165,12 +392,43 @@ class APIGame:
                 },
             )
 
+        self._register_media_routes(app)
+
         # Register routes for each quiz
         for subpath, quiz_data in self.quizzes.items():
             self._register_quiz_routes(app, subpath, quiz_data, templates)
 
+        if self.admin_token is not None:
+            self._register_admin_routes(app)
+
         uvicorn.run(app, host=host, port=port)
 
+    def _register_media_routes(self, app: FastAPI):
+        """Register the route serving media assets.
+
+        Args:
+            app: The FastAPI application instance.
+        """
+        # Asset URLs change with their content, so they never need revalidation
+        cache_control = "public, max-age=31536000, immutable"
+
+        @app.api_route("/media/{name}", methods=["GET", "HEAD"])
+        async def media_asset(name: str, request: Request):
+            """Serve a media asset, with support for range requests."""
+            asset = self.media.get(name)
+            if asset is None:
+                raise HTTPException(status_code=404, detail="unknown media asset")
+
+            headers = {"ETag": asset.etag, "Cache-Control": cache_control}
+            if _etag_matches(request.headers.get("if-none-match"), asset.etag):
+                return Response(status_code=304, headers=headers)
+            return FileResponse(
+                asset.path,
+                media_type=asset.content_type,
+                headers=headers,
+                stat_result=asset.stat,
+            )
+
     def _register_quiz_routes(
         self, app: FastAPI, subpath: str, quiz_data: dict, templates: Jinja2Templates
     ):
@@ -182,13 +440,24 @@ class APIGame:
         Args:
             app: The FastAPI application instance.
             subpath: The URL path prefix for this quiz.
-            quiz_data: Dictionary containing "title" and "qs" for the quiz.
+            quiz_data: Dictionary containing "title", "qs" and options for the quiz.
             templates: Jinja2 templates instance for rendering pages.
         """
         title = quiz_data["title"]
         qs = quiz_data["qs"]
+        offline = quiz_data["offline"]
+        prefetch = quiz_data["prefetch"]
         prefix = f"/{subpath}"
 
+        sessions = None
+        if (
+            quiz_data["time_limit"] is not None
+            or quiz_data["session_limit"] is not None
+        ):
+            sessions = TimedSessions(
+                quiz_data["time_limit"], quiz_data["session_limit"]
+            )
+
         @app.get(prefix + "/", response_class=HTMLResponse)
         async def quiz_landing_page(request: Request):
             """Landing page for a specific quiz with category selection."""
@@ -198,6 +467,8 @@ class APIGame:
                     "request": request,
                     "title": title,
                     "categories": list(qs.keys()),
+                    "offline": offline,
+                    "prefetch": prefetch,
                 },
             )
 
@@ -205,54 +476,305 @@ class APIGame:
         async def quiz_next_question(request: Request):
             """API endpoint to fetch the next question.
 
-            Request body: {"categories": ["cat1", "cat2", ...]}
+            Request body: {"categories": ["cat1", "cat2", ...], "session": "..."}
             Response: {"complete": false, "question": {...}}
+
+            For timed quizzes, the response also contains "session", and the
+            question a "token" and its "time_limit" in seconds. The session
+            must be sent with the next requests. Once it is over, the
+            response is {"complete": true, "expired": true}.
             """
             data = await request.json()
             print(data)
+            if sessions is not None:
+                _check_session_fields(data, "session")
+
             categories = data.get("categories", [])
             cat = choice(categories)
             q = qs[cat]
             seed = q.get_seed()
+
+            timing = {}
+            if sessions is not None:
+                issued = sessions.next_question(
+                    data.get("session"), _question_key(cat, seed)
+                )
+                if issued is None:
+                    return JSONResponse({"complete": True, "expired": True})
+                session_id, token, remaining = issued
+                timing = {"token": token, "time_limit": remaining}
+
             prompt = q.ask(seed)
 
-            return JSONResponse(
-                {
-                    "complete": False,
-                    "question": {
-                        "category": cat,
-                        "seed": seed,
-                        "text": prompt["text"],
-                        "type": prompt.get("type", "simple"),
-                        "context": prompt.get("context", ""),
-                        "hints": prompt.get("hints", []),
-                    },
-                }
+            response = {
+                "complete": False,
+                "question": {
+                    "category": cat,
+                    "seed": seed,
+                    "text": prompt["text"],
+                    "type": prompt.get("type", "simple"),
+                    "context": prompt.get("context", ""),
+                    "hints": prompt.get("hints", []),
+                    "options": prompt.get("options", []),
+                    "media": prompt.get("media", []),
+                    **timing,
+                },
+            }
+            if sessions is not None:
+                response["session"] = session_id
+            return JSONResponse(response)
+
+        # Grading on the server returns the correct answer, which would undo
+        # hashing the answers of an offline quiz
+        graded_online = not (offline and quiz_data["hash_answers"])
+
+        if graded_online:
+
+            @app.post(prefix + "/api/submit", response_class=JSONResponse)
+            async def quiz_submit_answer(request: Request):
+                """API endpoint to submit an answer.
+
+                Request body: {"category": "...", "seed": ..., "answer": "..."}
+                    plus "session" and "token" for timed quizzes
+                Response: {"correct": true/false, "explanation": {...}, ...}
+
+                Late answers to timed quizzes are rejected with status 409:
+                {"expired": true, "detail": "..."}
+                """
+                data = await request.json()
+                print(data)
+                if sessions is not None:
+                    _check_session_fields(data, "session", "token")
+                    rejected = sessions.check_submit(
+                        data.get("session"),
+                        data.get("token"),
+                        _question_key(data.get("category"), data.get("seed")),
+                    )
+                    if rejected is not None:
+                        return JSONResponse(
+                            {"expired": True, "detail": rejected}, status_code=409
+                        )
+
+                cat = data["category"]
+                seed = data["seed"]
+                submitted_ans = data["answer"]
+
+                return JSONResponse(grade(qs[cat], seed, submitted_ans))
+
+        if sessions is None and graded_online:
+            self._register_bulk_route(app, prefix, qs)
+
+        if offline:
+            self._register_offline_routes(app, prefix, quiz_data)
+
+    def _register_bulk_route(self, app: FastAPI, prefix: str, qs: dict[str, Q]):
+        """Register the bulk grading route of a quiz.
+
+        Not registered for timed quizzes: rows carry no session or token, so
+        they would bypass the time limits.
+
+        Args:
+            app: The FastAPI application instance.
+            prefix: The URL path prefix for this quiz.
+            qs: Dictionary mapping category names to Q objects.
+        """
+
+        @app.post(prefix + "/api/grade_bulk")
+        async def quiz_grade_bulk(request: Request):
+            """API endpoint to grade many answers in one request.
+
+            Request body: JSON Lines or a JSON array of
+                {"category": "...", "seed": ..., "answer": "..."} rows,
+                or [category, seed, answer] arrays.
+            Response: JSON Lines, one result per row as soon as it is graded:
+                {"index": int, "category": "...", "correct": bool, ...}
+                Rows that cannot be graded get an "error" key instead.
+            """
+
+            body_read = False
+
+            async def rows():
+                nonlocal body_read
+                async for row in iter_json_rows(request.stream()):
+                    yield row
+                body_read = True
+
+            async def results():
+                # Hold results back while the body is being read, so clients
+                # that upload everything before reading the response do not
+                # deadlock. Past the limit, results stream as they come.
+                held = []
+                size = 0
+                streaming = False
+                try:
+                    async for result in agrade_many(qs, rows()):
+                        held.append(json.dumps(result) + "\n")
+                        size += len(held[-1])
+                        if streaming or body_read or size > _BULK_HOLD_BYTES:
+                            streaming = True
+                            yield "".join(held)
+                            held = []
+                except ValueError as e:
+                    held.append(json.dumps({"error": str(e)}) + "\n")
+                if held:
+                    yield "".join(held)
+
+            return _DuplexStreamingResponse(
+                results(), media_type="application/x-ndjson"
             )
 
-        @app.post(prefix + "/api/submit", response_class=JSONResponse)
-        async def quiz_submit_answer(request: Request):
-            """API endpoint to submit an answer.
+    def _register_offline_routes(self, app: FastAPI, prefix: str, quiz_data: dict):
+        """Register the bank download and result sync routes of an offline quiz.
 
-            Request body: {"category": "...", "seed": ..., "answer": "..."}
-            Response: {"correct": true/false, "explanation": {...}, ...}
+        The bank is serialized and compressed once here, so serving it costs
+        no more than sending the cached bytes.
+
+        Args:
+            app: The FastAPI application instance.
+            prefix: The URL path prefix for this quiz.
+            quiz_data: Dictionary containing "qs" and "hash_answers".
+        """
+        qs = quiz_data["qs"]
+        bank = build_bank(qs, hash_answers=quiz_data["hash_answers"])
+
+        @app.get(prefix + "/api/bank")
+        async def quiz_bank(request: Request):
+            """API endpoint serving every category of the quiz as one document.
+
+            Response: {"salt": str | null, "categories": {cat: {...}}}
+            """
+            headers = {
+                "ETag": bank.etag,
+                # Revalidate every time: the bank changes when the server is
+                # restarted with edited questions, and a 304 is cheap
+                "Cache-Control": "no-cache",
+                "Vary": "Accept-Encoding",
+            }
+            if _etag_matches(request.headers.get("if-none-match"), bank.etag):
+                return Response(status_code=304, headers=headers)
+            if "gzip" in request.headers.get("accept-encoding", ""):
+                headers["Content-Encoding"] = "gzip"
+                body = bank.gzipped
+            else:
+                body = bank.body
+            return Response(body, media_type="application/json", headers=headers)
+
+        @app.post(prefix + "/api/sync", response_class=JSONResponse)
+        async def quiz_sync_results(request: Request):
+            """API endpoint receiving a batch of client-graded answers.
+
+            The batch is only acknowledged and logged, not graded again, so
+            offline quizzes cost the server almost nothing. Rows with an
+            unknown category are skipped.
+
+            Request body: {"results": [{"category": "...", "seed": ..., "answer": "...",
+                                        "correct": bool}, ...]}
+            Response: {"received": int, "skipped": int}
             """
             data = await request.json()
-            print(data)
-            cat = data["category"]
-            seed = data["seed"]
-            submitted_ans = data["answer"]
-
-            q = qs[cat]
-            correct_ans = q.correct(seed)
-            correct = q.check(correct_ans, submitted_ans)
-            explain = q.explain(seed)
+            results = data.get("results", []) if isinstance(data, dict) else []
+            if not isinstance(results, list):
+                results = []
+            valid = [
+                r
+                for r in results
+                if isinstance(r, dict)
+                and isinstance(r.get("category"), str)
+                and r["category"] in qs
+            ]
+            n_correct = sum(r.get("correct") is True for r in valid)
+            print(f"{prefix}: synced {len(valid)} results, {n_correct} correct")
 
             return JSONResponse(
-                {
-                    "correct": correct,
-                    "submitted_answer": submitted_ans,
-                    "correct_answer": correct_ans,
-                    "explanation": explain,
-                }
+                {"received": len(valid), "skipped": len(results) - len(valid)}
             )
+
+    def _register_admin_routes(self, app: FastAPI):
+        """Register the token-protected admin API.
+
+        Args:
+            app: The FastAPI application instance.
+        """
+
+        expected = f"Bearer {self.admin_token}".encode()
+
+        def check_token(request: Request):
+            # Compared as bytes: compare_digest rejects non-ASCII str, and
+            # Starlette decodes headers as latin-1
+            auth = request.headers.get("authorization", "").encode("latin-1")
+            if not secrets.compare_digest(auth, expected):
+                raise HTTPException(status_code=401, detail="invalid admin token")
+
+        @app.get("/_admin/profile", response_class=JSONResponse)
+        async def admin_profile_report(request: Request):
+            """API endpoint returning the status and timings of the last profile.
+
+            Response: {"active": bool, "quiz": "...", "timings": [...], ...}
+            """
+            check_token(request)
+            return JSONResponse(self.profiler.report())
+
+        @app.post("/_admin/profile/start", response_class=JSONResponse)
+        async def admin_profile_start(request: Request):
+            """API endpoint to start profiling a quiz or category.
+
+            Request body: {"quiz": "...", "category": "..." | null,
+                           "seconds": 30, "mode": "timing" | "cprofile" | "sample"}
+            Response: the report of the new profile
+            """
+            check_token(request)
+            try:
+                data = await request.json()
+            except ValueError:
+                raise HTTPException(status_code=400, detail="body must be JSON")
+            if not isinstance(data, dict):
+                raise HTTPException(status_code=400, detail="body must be an object")
+            quiz = data.get("quiz")
+            if not isinstance(quiz, str) or quiz not in self.quizzes:
+                raise HTTPException(status_code=404, detail=f"unknown quiz {quiz!r}")
+            try:
+                report = self.profiler.start(
+                    self.quizzes[quiz]["qs"],
+                    quiz=quiz,
+                    category=data.get("category"),
+                    seconds=float(data.get("seconds", 30)),
+                    mode=data.get("mode", "timing"),
+                )
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=f"unknown category {e}")
+            except (TypeError, ValueError) as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except RuntimeError as e:
+                raise HTTPException(status_code=409, detail=str(e))
+            return JSONResponse(report)
+
+        @app.post("/_admin/profile/stop", response_class=JSONResponse)
+        async def admin_profile_stop(request: Request):
+            """API endpoint to stop the running profile early.
+
+            Response: the final report of the profile
+            """
+            check_token(request)
+            return JSONResponse(self.profiler.stop())
+
+        @app.get("/_admin/profile/pstats")
+        async def admin_profile_pstats(request: Request):
+            """API endpoint to download the last "cprofile" profile as pstats."""
+            check_token(request)
+            data = self.profiler.pstats()
+            if data is None:
+                raise HTTPException(status_code=404, detail="no cprofile data")
+            return Response(
+                data,
+                media_type="application/octet-stream",
+                headers={"Content-Disposition": 'attachment; filename="ezquiz.pstats"'},
+            )
+
+        @app.get("/_admin/profile/collapsed", response_class=PlainTextResponse)
+        async def admin_profile_collapsed(request: Request):
+            """API endpoint to download the last "sample" profile as collapsed stacks."""
+            check_token(request)
+            data = self.profiler.collapsed()
+            if data is None:
+                raise HTTPException(status_code=404, detail="no sampling data")
+            return PlainTextResponse(data)
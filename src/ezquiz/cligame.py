@@ -1,16 +1,156 @@
+"""CLIGame - Terminal-based quiz runner.
+
+Asks questions from a set of categories on the command line until the goal
+of the chosen mode is reached.
+
+Example:
+    >>> from ezquiz import Q
+    >>> from ezquiz.cligame import CLIGame
+    >>>
+    >>> capitals = Q.from_dict({"Capital of France?": "Paris"})
+    >>> game = CLIGame({"capitals": capitals})
+    >>>
+    >>> # Answer as many questions as possible in 60 seconds,
+    >>> # with at most 10 seconds per question
+    >>> game.start("timed", 60, time_limit=10)
+"""
+
+import time
+from random import choice
 from typing import Literal
 
+from ezquiz.ezquiz import Q
+
 
 class CLIGame:
-    def __init__(self) -> None:
+    """Quiz runner for the terminal.
+
+    Attributes:
+        qs: Dictionary mapping category names to Q objects.
+        score: Number of correct answers in the current game.
+        mistakes: Number of wrong or late answers in the current game.
+        streak: Number of correct answers in a row.
+        history: One dict per answered question, with "category", "seed",
+                "answer", "correct", "late" and "seconds".
+    """
+
+    def __init__(self, qs: dict[str, Q] | None = None) -> None:
+        """Initialize a game.
+
+        Args:
+            qs: Dictionary mapping category names to Q objects.
+        """
+        self.qs = qs or {}
         self.score = 0
         self.mistakes = 0
         self.streak = 0
         self.history = []
 
+    def _done(self, mode: str, param, deadline: float | None) -> bool:
+        if mode == "timed":
+            return time.monotonic() >= deadline
+        if mode == "score":
+            return self.score >= param
+        if mode == "mistakes":
+            return self.mistakes >= param
+        if mode == "total":
+            return len(self.history) >= param
+        return self.streak >= param  # "streak"
+
     def start(
         self,
         mode: Literal["timed", "score", "mistakes", "total", "streak"] = "score",
         param=10,
+        *,
+        time_limit: float | None = None,
     ):
-        pass
+        """Run a game until the goal of the mode is reached.
+
+        Modes:
+            - "timed": the game lasts `param` seconds.
+            - "score": until `param` correct answers.
+            - "mistakes": until `param` wrong answers.
+            - "total": `param` questions.
+            - "streak": until `param` correct answers in a row.
+
+        Time is measured on the monotonic clock. An answer given after the
+        question's time limit, or after the end of a timed game, counts as
+        a mistake and is not graded.
+
+        Args:
+            mode: Goal of the game.
+            param: Target number (or seconds, for "timed").
+            time_limit: Optional seconds allowed per question.
+
+        Raises:
+            ValueError: If the game has no categories or the mode is unknown.
+        """
+        if not self.qs:
+            raise ValueError("no categories to ask from")
+        if mode not in ("timed", "score", "mistakes", "total", "streak"):
+            raise ValueError(f"unknown mode {mode!r}")
+
+        self.score = 0
+        self.mistakes = 0
+        self.streak = 0
+        self.history = []
+        deadline = time.monotonic() + param if mode == "timed" else None
+
+        while not self._done(mode, param, deadline):
+            cat = choice(list(self.qs))
+            q = self.qs[cat]
+            seed = q.get_seed()
+            prompt = q.ask(seed)
+
+            print()
+            if prompt.get("context"):
+                print(prompt["context"])
+            print(prompt["text"])
+            options = prompt.get("options", [])
+            for i, option in enumerate(options, 1):
+                print(f"  {i}. {option}")
+
+            # Both limits are checked when the answer arrives; input()
+            # cannot be interrupted portably
+            asked = time.monotonic()
+            answer_deadline = deadline
+            if time_limit is not None:
+                answer_deadline = min(asked + time_limit, deadline or float("inf"))
+            answer = input("> ").strip()
+            answered = time.monotonic()
+
+            # A number picks an option, unless it is itself one of the
+            # options (numeric banks)
+            if (
+                answer not in options
+                and answer.isdigit()
+                and 1 <= int(answer) <= len(options)
+            ):
+                answer = options[int(answer) - 1]
+
+            late = answer_deadline is not None and answered > answer_deadline
+            correct_ans = q.correct(seed)
+            correct = not late and q.check(correct_ans, answer)
+
+            if correct:
+                self.score += 1
+                self.streak += 1
+                print("Correct!")
+            else:
+                self.mistakes += 1
+                self.streak = 0
+                print("Time's up!" if late else "Incorrect.", f"Answer: {correct_ans}")
+
+            self.history.append(
+                {
+                    "category": cat,
+                    "seed": seed,
+                    "answer": answer,
+                    "correct": correct,
+                    "late": late,
+                    "seconds": answered - asked,
+                }
+            )
+
+        print()
+        print(f"Score: {self.score}, mistakes: {self.mistakes}")
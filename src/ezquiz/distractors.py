@@ -0,0 +1,116 @@
+"""Distractor generation for multiple choice questions.
+
+A DistractorIndex is built once per bank. It groups the bank's answers by
+their first characters and by length, so plausible wrong options for a
+question can be drawn by sampling a few small buckets. The whole answer
+list is never scanned per question.
+
+Options are drawn from a random generator seeded with the question itself.
+The same question therefore always shows the same options in the same
+order, and grading needs no server-side state.
+
+Example:
+    >>> index = DistractorIndex(["Paris", "Parma", "Tokyo", "Lima", "Oslo"])
+    >>> index.options("Capital of France?", "Paris", 3)
+    ['Lima', 'Parma', 'Paris']
+"""
+
+from random import Random
+
+PREFIX_LENGTH = 2
+LENGTH_BUCKET = 3
+
+
+class DistractorIndex:
+    """Index over a bank's answers for drawing multiple choice distractors.
+
+    Candidates are tried from the most to the least similar group: answers
+    sharing a prefix, then answers of similar length, then any answer.
+
+    Attributes:
+        answers: Distinct answers of the bank, in bank order.
+        case_sensitive: Whether answers differing only in case are distinct.
+    """
+
+    def __init__(self, answers, case_sensitive: bool = False) -> None:
+        """Build the index.
+
+        Args:
+            answers: All answers of the bank. Duplicates are dropped.
+            case_sensitive: Treat answers differing only in case as distinct.
+        """
+        self.case_sensitive = case_sensitive
+        self.answers: list[str] = []
+        self._by_prefix: dict[str, list[str]] = {}
+        self._by_length: dict[int, list[str]] = {}
+
+        seen = set()
+        for answer in answers:
+            answer = str(answer)
+            key = self._normalize(answer)
+            if key in seen:
+                continue
+            seen.add(key)
+            self.answers.append(answer)
+            self._by_prefix.setdefault(key[:PREFIX_LENGTH], []).append(answer)
+            self._by_length.setdefault(len(key) // LENGTH_BUCKET, []).append(answer)
+
+    def _normalize(self, answer: str) -> str:
+        return answer if self.case_sensitive else answer.lower()
+
+    def distractors(self, answer: str, k: int, rng: Random) -> list[str]:
+        """Draw up to k distinct wrong answers similar to the given one.
+
+        Args:
+            answer: The correct answer.
+            k: Number of distractors wanted.
+            rng: Random generator to draw with.
+
+        Returns:
+            Up to k answers different from the correct one. Fewer are
+            returned only if the bank has fewer other answers.
+        """
+        key = self._normalize(answer)
+        length = len(key) // LENGTH_BUCKET
+        groups = [
+            self._by_prefix.get(key[:PREFIX_LENGTH], []),
+            self._by_length.get(length, []),
+            self._by_length.get(length - 1, []),
+            self._by_length.get(length + 1, []),
+            self.answers,
+        ]
+
+        chosen: list[str] = []
+        taken = {key}
+        for group in groups:
+            need = k - len(chosen)
+            if need <= 0:
+                break
+            # Oversample to make up for entries that are already taken
+            for candidate in rng.sample(group, min(len(group), need + len(taken))):
+                candidate_key = self._normalize(candidate)
+                if candidate_key not in taken:
+                    taken.add(candidate_key)
+                    chosen.append(candidate)
+                    if len(chosen) == k:
+                        break
+        return chosen
+
+    def options(self, seed, answer: str, n_options: int) -> list[str]:
+        """Return the shuffled options of a question.
+
+        The result depends only on the seed, so it is the same on every call.
+
+        Args:
+            seed: The question's seed, used to seed the random generator.
+            answer: The correct answer, always part of the options.
+            n_options: Total number of options, including the correct one.
+
+        Returns:
+            The correct answer and up to n_options - 1 distractors.
+        """
+        rng = Random(str(seed))
+        options = self.distractors(str(answer), n_options - 1, rng)
+        options.append(str(answer))
+        rng.shuffle(options)
+        return options
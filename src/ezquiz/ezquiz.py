@@ -33,9 +33,66 @@ Example:
 from random import choice
 from typing import Callable, Generic, TypeVar
 
+from ezquiz.distractors import DistractorIndex
+
 T = TypeVar("T")
 
 
+# The defaults and the from_dict helpers below are module-level rather than
+# lambdas so that Q objects built from them can be pickled, e.g. to load
+# banks in worker processes.
+
+
+def _default_check(correct_ans, submitted_ans: str) -> bool:
+    return str(correct_ans) == submitted_ans
+
+
+def _default_explain(_) -> dict:
+    return {"type": "text_diff"}
+
+
+class _DictBank:
+    """Question functions for a static question -> answer dictionary."""
+
+    def __init__(
+        self,
+        dct: dict,
+        question_type: str,
+        case_sensitive: bool,
+        n_options: int,
+    ) -> None:
+        self.dct = dct
+        self.keys = list(dct.keys())
+        self.question_type = question_type
+        self.case_sensitive = case_sensitive
+        self.n_options = n_options
+        self.index = None
+        if question_type == "choice":
+            self.index = DistractorIndex(dct.values(), case_sensitive)
+
+    def get_seed(self):
+        return choice(self.keys)
+
+    def ask(self, seed) -> dict:
+        prompt = {
+            "text": str(seed),
+            "type": self.question_type,
+            "context": "",
+            "hints": [],
+        }
+        if self.index is not None:
+            prompt["options"] = self.index.options(seed, self.dct[seed], self.n_options)
+        return prompt
+
+    def correct(self, seed):
+        return self.dct[seed]
+
+    def check(self, correct_ans, submitted_ans: str) -> bool:
+        if self.case_sensitive:
+            return str(correct_ans) == submitted_ans
+        return str(correct_ans).lower() == submitted_ans.lower()
+
+
 class Q(Generic[T]):
     """A generic question template for creating quiz questions.
 
@@ -49,12 +106,18 @@ class Q(Generic[T]):
         get_seed: Function that returns a seed of type T for question generation.
         ask: Function that takes a seed and returns a question dict with keys:
              - text: The question text
-             - type: "simple" or "fill"
+             - type: "simple", "fill" or "choice"
              - context: Optional context/instructions
              - hints: List of hints (optional)
+             - options: List of answer options (required for "choice")
         correct: Function that takes a seed and returns the correct answer.
         check: Function that validates submitted answers against correct answers.
         explain: Function that provides explanation for incorrect answers.
+        bank: The question -> answer dictionary for instances built with
+              `from_dict`, or None for custom questions. Static banks can be
+              shipped to the browser and graded client-side.
+        question_type: Question type of a `from_dict` bank, or None.
+        case_sensitive: Answer matching mode of a `from_dict` bank.
 
     Example:
         >>> # Simple math question
@@ -87,24 +150,28 @@ class Q(Generic[T]):
         self.correct = correct
 
         if check is None:
-            self.check = (
-                lambda correct_ans, submitted_ans: str(correct_ans) == submitted_ans
-            )
+            self.check = _default_check
         else:
             self.check = check
 
         if explain is None:
-            self.explain = lambda _: {"type": "text_diff"}
+            self.explain = _default_explain
 
         else:
             self.explain = explain
 
+        # Only set by from_dict; custom questions are opaque to the server
+        self.bank: dict | None = None
+        self.question_type: str | None = None
+        self.case_sensitive = False
+
     @classmethod
     def from_dict(
         cls,
         dct: dict,
         question_type: str = "simple",
         case_sensitive: bool = False,
+        n_options: int = 4,
         **kwargs,
     ):
         """Create a Q instance from a dictionary of questions and answers.
@@ -114,10 +181,14 @@ class Q(Generic[T]):
 
         Args:
             dct: Dictionary mapping question strings to their correct answers.
-            question_type: Type of question input - "simple" (text field) or
-                          "fill" (inline input in text).
+            question_type: Type of question input - "simple" (text field),
+                          "fill" (inline input in text) or "choice"
+                          (multiple choice between the bank's answers).
             case_sensitive: Whether answer comparison is case-sensitive.
                           Defaults to False (case-insensitive).
+            n_options: Number of options shown for "choice" questions,
+                          including the correct one. Wrong options are
+                          other answers of the bank that look similar.
             **kwargs: Additional arguments passed to Q constructor.
 
         Returns:
@@ -141,28 +212,23 @@ class Q(Generic[T]):
             ...     {"Enter the secret code:": "ABC123"},
             ...     case_sensitive=True
             ... )
+            >>>
+            >>> # Multiple choice between the bank's answers
+            >>> q = Q.from_dict(
+            ...     {"Capital of France?": "Paris", "Capital of Peru?": "Lima"},
+            ...     question_type="choice",
+            ... )
         """
 
-        def make_check():
-            if case_sensitive:
-                return (
-                    lambda correct_ans, submitted_ans: str(correct_ans) == submitted_ans
-                )
-            else:
-                return (
-                    lambda correct_ans, submitted_ans: str(correct_ans).lower()
-                    == submitted_ans.lower()
-                )
-
-        return cls(
-            get_seed=lambda: choice(list(dct.keys())),
-            ask=lambda seed: {
-                "text": str(seed),
-                "type": question_type,
-                "context": "",
-                "hints": [],
-            },
-            correct=lambda seed: dct[seed],
-            check=make_check(),
+        bank = _DictBank(dct, question_type, case_sensitive, n_options)
+        q = cls(
+            get_seed=bank.get_seed,
+            ask=bank.ask,
+            correct=bank.correct,
+            check=bank.check,
             **kwargs,
         )
+        q.bank = dct
+        q.question_type = question_type
+        q.case_sensitive = case_sensitive
+        return q
@@ -0,0 +1,471 @@
+"""Answer grading, single and in bulk.
+
+Bulk grading is meant for importing answer sheets exported from other
+systems: tens of thousands of `(category, seed, answer)` rows at once.
+Rows are grouped by category and graded in batches on a thread pool.
+Results are produced as soon as each batch finishes, so neither the input
+nor the output has to be held in memory at once.
+
+Results come back out of order. Each result carries the `index` of its row
+in the input so callers can match them up.
+
+Example:
+    >>> rows = [
+    ...     {"category": "capitals", "seed": "Capital of France?", "answer": "Paris"},
+    ...     ("capitals", "Capital of Japan?", "Kyoto"),
+    ... ]
+    >>> for result in grade_many(qs, rows):
+    ...     print(result["index"], result["correct"])
+    0 True
+    1 False
+"""
+
+import asyncio
+import codecs
+import json
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from ezquiz.ezquiz import Q
+
+_WHITESPACE = " \t\r\n"
+
+
+def grade(q: Q, seed, submitted_ans: str) -> dict:
+    """Grade a single answer.
+
+    Args:
+        q: Question the answer belongs to.
+        seed: Seed the question was generated from.
+        submitted_ans: The submitted answer.
+
+    Returns:
+        Dictionary with "correct", "submitted_answer", "correct_answer"
+        and "explanation", as returned by the submit API.
+    """
+    correct_ans = q.correct(seed)
+    return {
+        "correct": q.check(correct_ans, submitted_ans),
+        "submitted_answer": submitted_ans,
+        "correct_answer": correct_ans,
+        "explanation": q.explain(seed),
+    }
+
+
+def _unpack_row(row) -> tuple:
+    """Return (category, seed, answer) from a dict or sequence row."""
+    if isinstance(row, dict):
+        return row["category"], row["seed"], row["answer"]
+    category, seed, answer = row
+    return category, seed, answer
+
+
+def _grade_batch(q: Q, category: str, batch: list[tuple]) -> list[dict]:
+    """Grade a batch of (index, seed, answer) rows of one category.
+
+    Errors raised by the question's functions are reported per row instead
+    of aborting the batch.
+    """
+    results = []
+    for index, seed, answer in batch:
+        try:
+            result = grade(q, seed, answer)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        results.append({"index": index, "category": category, **result})
+    return results
+
+
+class _Batcher:
+    """Groups incoming rows into per-category batches."""
+
+    def __init__(self, qs: dict[str, Q], batch_size: int) -> None:
+        self.qs = qs
+        self.batch_size = batch_size
+        self.batches: dict[str, list[tuple]] = {}
+
+    def add(self, index: int, row) -> tuple | dict | None:
+        """Add a row.
+
+        Returns:
+            An error result if the row is invalid, a full (q, category, batch)
+            job if this row completed a batch, or None.
+        """
+        if isinstance(row, _MalformedRow):
+            return {"index": index, "error": row.message}
+        try:
+            category, seed, answer = _unpack_row(row)
+        except (KeyError, TypeError, ValueError):
+            return {"index": index, "error": "row must be (category, seed, answer)"}
+        if not isinstance(category, str):
+            return {"index": index, "error": "category must be a string"}
+        if category not in self.qs:
+            return {
+                "index": index,
+                "category": category,
+                "error": f"unknown category {category!r}",
+            }
+
+        batch = self.batches.setdefault(category, [])
+        batch.append((index, seed, answer))
+        if len(batch) < self.batch_size:
+            return None
+        del self.batches[category]
+        return self.qs[category], category, batch
+
+    def drain(self) -> Iterator[tuple]:
+        """Yield the remaining partial batches as (q, category, batch) jobs."""
+        for category, batch in self.batches.items():
+            yield self.qs[category], category, batch
+        self.batches = {}
+
+
+def _resolve_workers(max_workers: int | None) -> int:
+    # Same default as ThreadPoolExecutor
+    return max_workers or min(32, (os.cpu_count() or 1) + 4)
+
+
+def grade_many(
+    qs: dict[str, Q],
+    rows: Iterable,
+    *,
+    batch_size: int = 256,
+    max_workers: int | None = None,
+) -> Iterator[dict]:
+    """Grade many answers, yielding results as batches complete.
+
+    Rows are consumed lazily. At most two batches per worker are in flight,
+    so memory use stays bounded however long the input is.
+
+    Args:
+        qs: Dictionary mapping category names to Q objects.
+        rows: Iterable of `{"category", "seed", "answer"}` dicts or
+              `(category, seed, answer)` sequences.
+        batch_size: Number of rows of the same category graded per task.
+        max_workers: Size of the thread pool. Threads only help if the
+                    question functions release the GIL (I/O, C extensions).
+
+    Yields:
+        Result dicts with "index" and "category" added to the usual submit
+        response, or with an "error" key if the row could not be graded.
+    """
+    workers = _resolve_workers(max_workers)
+    batcher = _Batcher(qs, batch_size)
+
+    # Not a `with` block: if the consumer stops early, exiting it would wait
+    # for every batch in flight
+    pool = ThreadPoolExecutor(workers)
+    try:
+        pending = set()
+        for index, row in enumerate(rows):
+            job = batcher.add(index, row)
+            if job is None:
+                continue
+            if isinstance(job, dict):
+                yield job
+                continue
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+            pending.add(pool.submit(_grade_batch, *job))
+
+        for job in batcher.drain():
+            pending.add(pool.submit(_grade_batch, *job))
+        for future in as_completed(pending):
+            yield from future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def agrade_many(
+    qs: dict[str, Q],
+    rows: AsyncIterable,
+    *,
+    batch_size: int = 256,
+    max_workers: int | None = None,
+) -> AsyncIterator[dict]:
+    """Async variant of `grade_many` for rows arriving from a request body.
+
+    Grading runs on a thread pool so the event loop keeps serving other
+    requests. See `grade_many` for the arguments and result format.
+
+    Raises:
+        ValueError: If reading `rows` raises it, e.g. for a malformed body.
+                    Results for every row read before are yielded first.
+    """
+    loop = asyncio.get_running_loop()
+    workers = _resolve_workers(max_workers)
+    batcher = _Batcher(qs, batch_size)
+
+    # Exiting a `with` block on client disconnect would block the event loop
+    # until the batches in flight finish
+    pool = ThreadPoolExecutor(workers)
+    try:
+        pending = set()
+        index = 0
+        body_error = None
+        try:
+            async for row in rows:
+                job = batcher.add(index, row)
+                index += 1
+                if job is None:
+                    continue
+                if isinstance(job, dict):
+                    yield job
+                    continue
+                if len(pending) >= 2 * workers:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        for result in future.result():
+                            yield result
+                pending.add(loop.run_in_executor(pool, _grade_batch, *job))
+        except ValueError as e:
+            # Grade the rows read before the body went bad, then report it
+            body_error = e
+
+        for job in batcher.drain():
+            pending.add(loop.run_in_executor(pool, _grade_batch, *job))
+        for future in asyncio.as_completed(pending):
+            for result in await future:
+                yield result
+        if body_error is not None:
+            raise body_error
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _MalformedRow:
+    """Placeholder yielded by `iter_json_rows` for a row that is not valid JSON."""
+
+    __slots__ = ("message",)
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+
+class _RowParser:
+    """Incremental parser for a JSON array or JSON Lines body.
+
+    A body starting with `[` is either a JSON array of rows or JSON Lines
+    whose first row is a `[category, seed, answer]` array. The first value
+    after the bracket tells them apart: a row (object or array) or `]`
+    means a JSON array, a scalar (the category) means JSON Lines.
+
+    JSON Lines bodies are split on newlines, which cannot occur inside a
+    JSON value. In arrays, rows that are complete within a chunk are decoded
+    directly; a row split across chunks is scanned for its end by tracking
+    brackets and strings. Only the current partial row is kept, as a list of
+    pieces, so the work is linear in the body size. A row that does not
+    decode is yielded as a `_MalformedRow`; a body that cannot be split into
+    rows, or a row longer than `MAX_ROW_CHARS`, raises.
+    """
+
+    MAX_ROW_CHARS = 1 << 20
+
+    _STRUCTURE = re.compile(r'[\[\]{}"]')
+    _STRING_END = re.compile(r'["\\]')
+    _SCALAR_END = re.compile(r"[\s,\]]")
+
+    def __init__(self) -> None:
+        self._mode = None  # "lines" or "array", unknown until the first value
+        self._decoder = json.JSONDecoder()
+        self._head = ""
+        self._parts: list[str] = []  # Pieces of the current row
+        self._size = 0
+        # Array mode state
+        self._expect = "first"  # "first", "value" or "separator"
+        self._closed = False
+        self._in_row = False
+        self._scalar = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def _append(self, piece: str) -> None:
+        self._parts.append(piece)
+        self._size += len(piece)
+        if self._size > self.MAX_ROW_CHARS:
+            raise ValueError(
+                f"row longer than {self.MAX_ROW_CHARS} characters "
+                "(unterminated or not JSON)"
+            )
+
+    def _take_row(self) -> str:
+        text = "".join(self._parts)
+        self._parts = []
+        self._size = 0
+        return text
+
+    def _decode(self, text: str):
+        """Decode one stripped, non-empty row."""
+        try:
+            row, end = self._decoder.raw_decode(text)
+        except json.JSONDecodeError as e:
+            return _MalformedRow(f"invalid JSON: {e}")
+        if end != len(text):
+            return _MalformedRow(f"invalid JSON: extra data at char {end}")
+        return row
+
+    def feed(self, text: str, final: bool = False) -> Iterator:
+        """Parse the rows completed by the next piece of the body.
+
+        Args:
+            text: Next piece of the body.
+            final: Whether this is the end of the body.
+
+        Yields:
+            Decoded rows, or `_MalformedRow` for rows that are not JSON.
+
+        Raises:
+            ValueError: If the body is not valid JSON Lines or a JSON array.
+        """
+        if self._mode is None:
+            head = (self._head + text).lstrip(_WHITESPACE)
+            if head[:1] != "[":
+                self._mode = "lines" if head or final else None
+            else:
+                rest = head[1:].lstrip(_WHITESPACE)
+                if rest:
+                    self._mode = "array" if rest[0] in "{[]" else "lines"
+                elif final:
+                    raise ValueError("unterminated JSON array")
+            if self._mode is None:
+                self._head = head[:1]
+                return
+            text = rest if self._mode == "array" else head
+            self._head = ""
+
+        if self._mode == "lines":
+            yield from self._feed_lines(text, final)
+        else:
+            yield from self._feed_array(text)
+            if final and not self._closed:
+                raise ValueError("unterminated JSON array")
+
+    def _feed_lines(self, text: str, final: bool) -> Iterator:
+        lines = text.split("\n")
+        if len(lines) > 1:
+            # The first piece ends the line started in earlier chunks
+            self._append(lines[0])
+            lines[0] = self._take_row()
+        # The last piece starts a line that continues in later chunks
+        self._append(lines.pop())
+        if final:
+            lines.append(self._take_row())
+        for line in lines:
+            line = line.strip(_WHITESPACE)
+            if line:
+                yield self._decode(line)
+
+    def _feed_array(self, text: str) -> Iterator:
+        i = 0
+        n = len(text)
+        while i < n:
+            if not self._in_row:
+                c = text[i]
+                if c in _WHITESPACE:
+                    i += 1
+                    continue
+                if self._closed:
+                    raise ValueError("unexpected data after end of JSON array")
+                if self._expect == "separator":
+                    if c not in ",]":
+                        raise ValueError(f"expected ',' or ']' after a row, got {c!r}")
+                    self._closed = c == "]"
+                    self._expect = "value"
+                    i += 1
+                    continue
+                if c == "]" and self._expect == "first":
+                    self._closed = True
+                    i += 1
+                    continue
+                if c in ",]":
+                    raise ValueError(f"expected a row, got {c!r}")
+                # Fast path for rows that are complete in this chunk. A
+                # number ending the chunk may continue in the next one.
+                try:
+                    row, end = self._decoder.raw_decode(text, i)
+                except json.JSONDecodeError:
+                    pass
+                else:
+                    if end < n or text[end - 1] in '}]"':
+                        yield row
+                        self._expect = "separator"
+                        i = end
+                        continue
+                self._in_row = True
+                self._scalar = c not in '{["'
+                self._depth = 0
+
+            start = i
+            if self._scalar:
+                m = self._SCALAR_END.search(text, i)
+                if m is None:
+                    self._append(text[start:])
+                    return
+                i = m.start()
+                self._append(text[start:i])
+                self._in_row = False
+            else:
+                if self._escaped:
+                    i += 1
+                    self._escaped = False
+                while self._in_row:
+                    pattern = self._STRING_END if self._in_string else self._STRUCTURE
+                    m = pattern.search(text, i)
+                    if m is None:
+                        i = n
+                        break
+                    c = m.group()
+                    i = m.end()
+                    if c == "\\":
+                        if i == n:
+                            self._escaped = True
+                        else:
+                            i += 1
+                    elif c == '"':
+                        self._in_string = not self._in_string
+                        if not self._in_string and self._depth == 0:
+                            self._in_row = False
+                    elif c in "[{":
+                        self._depth += 1
+                    else:
+                        self._depth -= 1
+                        if self._depth == 0:
+                            self._in_row = False
+                self._append(text[start:i])
+                if self._in_row:
+                    return
+            self._expect = "separator"
+            yield self._decode(self._take_row().strip(_WHITESPACE))
+
+
+async def iter_json_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator:
+    """Parse rows incrementally from a JSON array or JSON Lines byte stream.
+
+    Only the current partial row is buffered, so arbitrarily large bodies
+    can be processed.
+
+    Args:
+        chunks: Raw body chunks, e.g. from `Request.stream()`.
+
+    Yields:
+        One decoded JSON value per row. Rows that are not valid JSON are
+        yielded as placeholders, which the graders report as per-row errors.
+
+    Raises:
+        ValueError: If the body is not valid JSON Lines or a JSON array.
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    parser = _RowParser()
+
+    async for chunk in chunks:
+        for row in parser.feed(utf8.decode(chunk)):
+            yield row
+    for row in parser.feed(utf8.decode(b"", final=True), final=True):
+        yield row
@@ -0,0 +1,293 @@
+"""Startup loading, validation and warm-up of question banks.
+
+Quizzes can be registered with a loader, a zero-argument function returning
+the `dict[str, Q]` of categories, instead of the categories themselves.
+Before the server accepts traffic, `load_quizzes` runs all loaders in
+parallel, checks every category, and calls each category's functions a few
+times so mistakes surface at startup rather than when a user hits them.
+
+Loaders run on a thread pool by default. With `executor="process"` they run
+in worker processes instead, which parallelizes CPU-heavy bank building.
+In that case the loader must be a module-level function and the returned
+Q objects must be picklable. `Q.from_dict` banks are; Q objects built from
+lambdas are not.
+
+Example:
+    >>> def load_capitals():
+    ...     with open("capitals.json") as f:
+    ...         return {"capitals": Q.from_dict(json.load(f))}
+    >>>
+    >>> game.add_quiz("geography", "World Geography", load_capitals)
+    >>> for report in game.prepare(executor="process"):
+    ...     print(report)
+    geography/capitals: loaded in 412.3 ms, warm-up 0.1 ms, ~18342.5 KiB
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from types import CodeType, FunctionType, MethodType, ModuleType
+from typing import Callable, Literal
+
+from ezquiz.ezquiz import Q
+from ezquiz.media import MEDIA_TYPES
+
+QUESTION_TYPES = ("simple", "fill", "choice")
+
+
+class BankError(ValueError):
+    """Raised when one or more question banks fail validation.
+
+    Attributes:
+        problems: One message per problem found, prefixed with quiz/category.
+    """
+
+    def __init__(self, problems: list[str]) -> None:
+        self.problems = problems
+        super().__init__(
+            "invalid question banks:\n" + "\n".join(f"  - {p}" for p in problems)
+        )
+
+
+class BankReport:
+    """Load statistics of a single category.
+
+    Attributes:
+        quiz: Subpath of the quiz.
+        category: Category name.
+        load_time: Seconds spent in the quiz's loader (shared by its categories).
+        warmup_time: Seconds spent validating and warming up the category.
+        memory: Approximate bytes reachable from the category's Q object.
+    """
+
+    def __init__(
+        self,
+        quiz: str,
+        category: str,
+        load_time: float,
+        warmup_time: float,
+        memory: int,
+    ) -> None:
+        self.quiz = quiz
+        self.category = category
+        self.load_time = load_time
+        self.warmup_time = warmup_time
+        self.memory = memory
+
+    def __str__(self) -> str:
+        return (
+            f"{self.quiz}/{self.category}: loaded in {self.load_time * 1000:.1f} ms, "
+            f"warm-up {self.warmup_time * 1000:.1f} ms, ~{self.memory / 1024:.1f} KiB"
+        )
+
+
+def _run_loader(loader: Callable[[], dict]) -> tuple[dict, float]:
+    """Call a loader and time it (module-level so it can run in a process)."""
+    start = time.perf_counter()
+    qs = loader()
+    return qs, time.perf_counter() - start
+
+
+def _check_bank(
+    category: str, q, offline: bool, hash_answers: bool = False
+) -> list[str]:
+    """Check the static structure of a category."""
+    if not isinstance(q, Q):
+        return [f"{category}: expected a Q object, got {type(q).__name__}"]
+    if q.bank is None:
+        if offline:
+            return [f"{category}: offline quizzes need Q.from_dict categories"]
+        return []
+
+    problems = []
+    if offline and hash_answers and q.question_type == "choice":
+        problems.append(
+            f"{category}: choice banks cannot hide answers by hashing, "
+            "use hash_answers=False"
+        )
+    if not q.bank:
+        problems.append(f"{category}: bank is empty")
+    for text, answer in q.bank.items():
+        # Question keys only need to survive the JSON round-trip of seeds,
+        # which the warm-up checks
+        if not isinstance(answer, str):
+            problems.append(
+                f"{category}: answer to {text!r} is {type(answer).__name__}, not str"
+            )
+    return problems
+
+
+def _warm_up(category: str, q: Q, runs: int) -> tuple[list[str], float]:
+    """Generate, ask and grade a few questions the way the server would."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        step = "get_seed"
+        try:
+            seed = q.get_seed()
+            step = "seed serialization"
+            # Seeds round-trip through the browser as JSON
+            seed = json.loads(json.dumps(seed))
+            step = "ask"
+            prompt = q.ask(seed)
+            if not isinstance(prompt, dict) or not isinstance(prompt.get("text"), str):
+                raise TypeError(f"must return a dict with a 'text' string: {prompt!r}")
+            if prompt.get("type", "simple") not in QUESTION_TYPES:
+                raise ValueError(f"unknown question type {prompt['type']!r}")
+            for media in prompt.get("media", []):
+                if not isinstance(media, dict) or media.get("type") not in MEDIA_TYPES:
+                    raise ValueError(f"invalid media entry {media!r}")
+            step = "correct"
+            correct_ans = q.correct(seed)
+            if prompt.get("type") == "choice" and str(correct_ans) not in (
+                prompt.get("options") or []
+            ):
+                raise ValueError(f"correct answer {correct_ans!r} is not an option")
+            step = "check"
+            # Only that it runs: `correct` may return a display string (e.g.
+            # "color / colour") that `check` is not meant to accept verbatim
+            if q.check(correct_ans, str(correct_ans)) is None:
+                raise TypeError("returned None instead of a verdict")
+            step = "explain"
+            explanation = q.explain(seed)
+            if not isinstance(explanation, dict) or "type" not in explanation:
+                raise TypeError(f"must return a dict with a 'type': {explanation!r}")
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            return [f"{category}: {step} failed: {type(e).__name__}: {e}"], elapsed
+    return [], time.perf_counter() - start
+
+
+def deep_sizeof(obj) -> int:
+    """Approximate the memory retained by an object.
+
+    Follows containers, instance attributes and function closures.
+    Modules, classes and code objects are not counted.
+
+    Args:
+        obj: Object to measure.
+
+    Returns:
+        Sum of `sys.getsizeof` over all reachable objects, in bytes.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, (type, ModuleType, CodeType)):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif isinstance(o, FunctionType):
+            for cell in o.__closure__ or ():
+                try:
+                    stack.append(cell.cell_contents)
+                except ValueError:  # Empty cell
+                    pass
+            stack.extend(o.__defaults__ or ())
+        elif isinstance(o, MethodType):
+            stack.append(o.__self__)
+        elif hasattr(o, "__dict__"):
+            stack.append(vars(o))
+    return total
+
+
+def load_quizzes(
+    quizzes: dict[str, dict],
+    *,
+    max_workers: int | None = None,
+    warmup: int = 3,
+    executor: Literal["thread", "process"] = "thread",
+) -> list[BankReport]:
+    """Load, validate and warm up quizzes registered with `APIGame.add_quiz`.
+
+    Loaders are replaced by the categories they return, so each quiz's "qs"
+    is a `dict[str, Q]` afterwards. Quizzes marked as loaded are skipped.
+
+    Args:
+        quizzes: The `APIGame.quizzes` dictionary.
+        max_workers: Size of the worker pools.
+        warmup: Number of questions generated and graded per category.
+        executor: Run loaders on "thread"s or in worker "process"es.
+                Validation and warm-up always run on threads.
+
+    Returns:
+        One report per category, in registration order.
+
+    Raises:
+        BankError: If any loader fails or any category is invalid. All
+                problems are collected before raising.
+    """
+    pending = {
+        subpath: quiz_data
+        for subpath, quiz_data in quizzes.items()
+        if not quiz_data.get("loaded")
+    }
+    problems = []
+    load_times = {}
+
+    pool_cls: type[Executor]
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    loaders = {s: d["qs"] for s, d in pending.items() if callable(d["qs"])}
+    if loaders:
+        with pool_cls(max_workers) as pool:
+            futures = {s: pool.submit(_run_loader, f) for s, f in loaders.items()}
+            for subpath, future in futures.items():
+                try:
+                    pending[subpath]["qs"], load_times[subpath] = future.result()
+                except Exception as e:
+                    problems.append(
+                        f"{subpath}: loader failed: {type(e).__name__}: {e}"
+                    )
+
+    banks = []
+    for subpath, quiz_data in pending.items():
+        qs = quiz_data["qs"]
+        if callable(qs):  # Loader failed
+            continue
+        if not isinstance(qs, dict):
+            problems.append(
+                f"{subpath}: expected dict[str, Q], got {type(qs).__name__}"
+            )
+            continue
+        for category, q in qs.items():
+            found = _check_bank(
+                category,
+                q,
+                quiz_data.get("offline", False),
+                quiz_data.get("hash_answers", True),
+            )
+            problems.extend(f"{subpath}/{p}" for p in found)
+            if not found:
+                banks.append((subpath, category, q))
+
+    reports = []
+    with ThreadPoolExecutor(max_workers) as pool:
+        futures = [
+            (subpath, category, q, pool.submit(_warm_up, category, q, warmup))
+            for subpath, category, q in banks
+        ]
+        for subpath, category, q, future in futures:
+            found, warmup_time = future.result()
+            problems.extend(f"{subpath}/{p}" for p in found)
+            reports.append(
+                BankReport(
+                    subpath,
+                    category,
+                    load_times.get(subpath, 0.0),
+                    warmup_time,
+                    deep_sizeof(q),
+                )
+            )
+
+    if problems:
+        raise BankError(problems)
+    for quiz_data in pending.values():
+        quiz_data["loaded"] = True
+    return reports
@@ -0,0 +1,142 @@
+"""Content-addressed store for question media (images and audio).
+
+Files are registered once and served by APIGame under
+`/media/<sha256><suffix>`. The URL changes whenever the content does, so
+responses carry a strong ETag and can be cached forever (`immutable`).
+Range requests are supported for audio seeking. Files are streamed in
+chunks; the uvicorn server started by `APIGame.start` does not implement the
+ASGI pathsend extension, so there is no zero-copy sendfile.
+
+Registered files must not be modified while the server runs.
+
+Example:
+    >>> game = APIGame()
+    >>> meow = game.media.add("sounds/meow.ogg")
+    >>>
+    >>> animal_q = Q[str](
+    ...     get_seed=lambda: "cat",
+    ...     ask=lambda seed: {
+    ...         "text": "Which animal makes this sound?",
+    ...         "type": "simple",
+    ...         "media": [meow.ref()],
+    ...     },
+    ...     correct=lambda seed: seed,
+    ... )
+"""
+
+import hashlib
+import mimetypes
+import os
+import tempfile
+from pathlib import Path
+
+MEDIA_TYPES = ("image", "audio")
+
+
+class MediaAsset:
+    """A registered media file.
+
+    Attributes:
+        digest: SHA-256 of the file content, hex-encoded.
+        name: File name under /media/, the digest plus the original suffix.
+        path: Location of the file on disk.
+        content_type: MIME type guessed from the suffix.
+        stat: `os.stat` result taken at registration.
+    """
+
+    def __init__(self, digest: str, path: Path, content_type: str) -> None:
+        self.digest = digest
+        self.name = digest + path.suffix.lower()
+        self.path = path
+        self.content_type = content_type
+        self.stat = os.stat(path)
+
+    @property
+    def url(self) -> str:
+        """URL the asset is served at."""
+        return f"/media/{self.name}"
+
+    @property
+    def etag(self) -> str:
+        """Strong ETag of the asset."""
+        return f'"{self.digest}"'
+
+    def ref(self, media_type: str | None = None) -> dict:
+        """Return the entry to put in the "media" list of a question.
+
+        Args:
+            media_type: "image" or "audio". Guessed from the MIME type if
+                    not given.
+
+        Returns:
+            Dictionary with "type" and "src".
+
+        Raises:
+            ValueError: If the type cannot be guessed or is not supported.
+        """
+        media_type = media_type or self.content_type.split("/")[0]
+        if media_type not in MEDIA_TYPES:
+            raise ValueError(f"unsupported media type {media_type!r} for {self.path}")
+        return {"type": media_type, "src": self.url}
+
+
+class MediaStore:
+    """Registry of media assets, keyed by content hash.
+
+    Adding the same content twice returns the same asset.
+    """
+
+    def __init__(self, root: str | Path | None = None) -> None:
+        """Initialize an empty store.
+
+        Args:
+            root: Directory where assets added as bytes are written.
+                  Defaults to a temporary directory created on first use.
+        """
+        self.root = Path(root) if root is not None else None
+        self.assets: dict[str, MediaAsset] = {}  # name -> asset
+
+    def add(self, path: str | Path) -> MediaAsset:
+        """Register a file. The file is served in place, not copied.
+
+        Args:
+            path: Path of the image or audio file.
+
+        Returns:
+            The registered asset.
+        """
+        path = Path(path).resolve()
+        with open(path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        return self._register(digest, path)
+
+    def add_bytes(self, data: bytes, suffix: str) -> MediaAsset:
+        """Register in-memory content, e.g. generated images or audio.
+
+        Args:
+            data: File content.
+            suffix: File extension including the dot (e.g. ".png"), used
+                    to determine the content type.
+
+        Returns:
+            The registered asset.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        if self.root is None:
+            self.root = Path(tempfile.mkdtemp(prefix="ezquiz-media-"))
+        path = self.root / (digest + suffix.lower())
+        if not path.exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        return self._register(digest, path)
+
+    def _register(self, digest: str, path: Path) -> MediaAsset:
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        name = digest + path.suffix.lower()
+        if name not in self.assets:
+            self.assets[name] = MediaAsset(digest, path, content_type)
+        return self.assets[name]
+
+    def get(self, name: str) -> MediaAsset | None:
+        """Look up an asset by its name under /media/."""
+        return self.assets.get(name)
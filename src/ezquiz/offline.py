@@ -0,0 +1,108 @@
+"""Client-side grading support for static question banks.
+
+Quizzes made only of `Q.from_dict` banks can be registered with
+`offline=True`. The server then serializes every category into a single
+JSON document, compresses it once, and serves it from `/{quiz}/api/bank`
+with an ETag so browsers can cache it. The web UI samples and grades
+questions locally and syncs results back in batches.
+
+Answers are stored as salted SHA-256 hashes by default, so the correct
+answer is not readable from the downloaded bank. The browser hashes the
+submitted answer with the same salt and compares digests.
+
+Example:
+    >>> bank = build_bank({"capitals": Q.from_dict({"Capital of France?": "Paris"})})
+    >>> bank.gzipped[:2]  # gzip magic number
+    b'\x1f\x8b'
+"""
+
+import gzip
+import hashlib
+import json
+import secrets
+
+from ezquiz.ezquiz import Q
+
+
+def hash_answer(salt: str, answer: str, case_sensitive: bool) -> str:
+    """Hash an answer the same way the web UI does.
+
+    Args:
+        salt: Per-bank random salt.
+        answer: Answer text to hash.
+        case_sensitive: If False, the answer is lowercased before hashing.
+
+    Returns:
+        Hex-encoded SHA-256 digest of salt + answer.
+    """
+    if not case_sensitive:
+        answer = answer.lower()
+    return hashlib.sha256((salt + answer).encode("utf-8")).hexdigest()
+
+
+class BankBlob:
+    """A serialized, pre-compressed question bank ready to be served.
+
+    Attributes:
+        body: The bank as UTF-8 encoded JSON.
+        gzipped: The same JSON, gzip-compressed.
+        etag: Strong ETag derived from the JSON content.
+    """
+
+    def __init__(self, document: dict) -> None:
+        """Serialize and compress a bank document.
+
+        Args:
+            document: JSON-serializable bank document.
+        """
+        self.body = json.dumps(document, separators=(",", ":")).encode("utf-8")
+        self.gzipped = gzip.compress(self.body, mtime=0)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+
+def build_bank(qs: dict[str, Q], hash_answers: bool = True) -> BankBlob:
+    """Build the client-side bank for a quiz.
+
+    Args:
+        qs: Dictionary mapping category names to `from_dict` Q objects.
+        hash_answers: Whether to replace answers with salted hashes.
+
+    Returns:
+        BankBlob containing every category of the quiz. Each question is
+        [text, answer], plus the list of options for "choice" banks.
+
+    Raises:
+        ValueError: If a category was not created with `Q.from_dict`, or
+                    is a "choice" bank and `hash_answers` is set.
+    """
+    salt = secrets.token_hex(8) if hash_answers else None
+    categories = {}
+    for cat, q in qs.items():
+        if q.bank is None:
+            raise ValueError(
+                f"category {cat!r} is not a static bank; "
+                "only Q.from_dict questions can be graded offline"
+            )
+        if salt is not None and q.question_type == "choice":
+            # Hashing the few options with the shipped salt reveals the answer
+            raise ValueError(
+                f"category {cat!r} is a choice bank, whose answers cannot be "
+                "hidden by hashing; use hash_answers=False"
+            )
+        questions = []
+        for text, answer in q.bank.items():
+            answer = str(answer)
+            if salt is not None:
+                answer = hash_answer(salt, answer, q.case_sensitive)
+            question = [str(text), answer]
+            if q.question_type == "choice":
+                # Options are deterministic per question, so compute them once
+                question.append(q.ask(text)["options"])
+            questions.append(question)
+        categories[cat] = {
+            "type": q.question_type,
+            "case_sensitive": q.case_sensitive,
+            "questions": questions,
+        }
+
+    return BankBlob({"salt": salt, "categories": categories})
@@ -0,0 +1,291 @@
+"""On-demand profiling of user-defined Q functions.
+
+The Profiler times the `get_seed`, `ask`, `correct`, `check` and `explain`
+functions of one quiz, or of one category of it, for a limited time.
+It works by temporarily replacing those attributes on the Q objects with
+timing wrappers. While no profile is running the originals are in place,
+so there is no overhead at all.
+
+Modes:
+    - "timing": wall and CPU time per function (always collected).
+    - "cprofile": additionally run each call under cProfile. Calls are
+      serialized while this mode is active. Results download as pstats.
+    - "sample": additionally sample the stacks of threads inside a profiled
+      call at a fixed interval. Results download as collapsed stacks, the
+      input format of flamegraph.pl and speedscope.
+
+Example:
+    >>> profiler = Profiler()
+    >>> profiler.start(qs, quiz="math", seconds=60, mode="sample")
+    >>> # ... serve traffic ...
+    >>> report = profiler.stop()
+    >>> report["timings"][0]
+    {'category': 'addition', 'callable': 'ask', 'calls': 412, ...}
+"""
+
+import cProfile
+import marshal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Literal
+
+from ezquiz.ezquiz import Q
+
+CALLABLES = ("get_seed", "ask", "correct", "check", "explain")
+
+Mode = Literal["timing", "cprofile", "sample"]
+
+
+class _Session:
+    """State of a single profiling run."""
+
+    def __init__(
+        self,
+        quiz: str,
+        category: str | None,
+        mode: Mode,
+        seconds: float,
+        interval: float,
+    ) -> None:
+        self.quiz = quiz
+        self.category = category
+        self.mode = mode
+        self.seconds = seconds
+        self.interval = interval
+        self.started = time.time()
+        self.stopped: float | None = None
+
+        self.lock = threading.Lock()
+        # (category, callable) -> [calls, wall_total, wall_max, cpu_total]
+        self.timings: dict[tuple[str, str], list] = {}
+        self.patched: list[tuple[Q, str, object]] = []
+
+        self.cprofile = cProfile.Profile() if mode == "cprofile" else None
+        self.cprofile_lock = threading.Lock()
+        self.local = threading.local()
+
+        self.samples: Counter[str] = Counter()
+        self.inside: dict[int, str] = {}  # thread id -> "category;callable"
+        self.sampler_stop = threading.Event()
+        self.wrapper_code = None
+
+    def wrap(self, category: str, name: str, fn):
+        """Return a timing wrapper for one Q function."""
+        key = (category, name)
+        label = f"{category};{name}"
+
+        def wrapper(*args):
+            tid = threading.get_ident()
+            nested = getattr(self.local, "depth", 0)
+            self.local.depth = nested + 1
+            if self.mode == "sample" and not nested:
+                self.inside[tid] = label
+            wall = time.perf_counter()
+            cpu = time.thread_time()
+            try:
+                if self.cprofile is not None and not nested:
+                    with self.cprofile_lock:
+                        return self.cprofile.runcall(fn, *args)
+                return fn(*args)
+            finally:
+                wall = time.perf_counter() - wall
+                cpu = time.thread_time() - cpu
+                self.local.depth = nested
+                if not nested:
+                    self.inside.pop(tid, None)
+                with self.lock:
+                    entry = self.timings.setdefault(key, [0, 0.0, 0.0, 0.0])
+                    entry[0] += 1
+                    entry[1] += wall
+                    entry[2] = max(entry[2], wall)
+                    entry[3] += cpu
+
+        self.wrapper_code = wrapper.__code__
+        return wrapper
+
+    def sample(self) -> None:
+        """Sampler thread: record the stacks of threads inside a Q function."""
+        while not self.sampler_stop.wait(self.interval):
+            frames = sys._current_frames()
+            for tid, label in list(self.inside.items()):
+                frame = frames.get(tid)
+                stack = []
+                while frame is not None and frame.f_code is not self.wrapper_code:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                # The thread left the wrapper after `inside` was read
+                if frame is None:
+                    continue
+                self.samples[";".join([label, *reversed(stack)])] += 1
+
+
+class Profiler:
+    """Runtime profiler for the Q functions of a quiz.
+
+    Only one profile runs at a time. The results of the last run stay
+    available after it stops, until the next one starts.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an idle profiler."""
+        self._lock = threading.Lock()
+        self._session: _Session | None = None
+        self._timer: threading.Timer | None = None
+
+    @property
+    def active(self) -> bool:
+        """Whether a profile is currently running."""
+        session = self._session
+        return session is not None and session.stopped is None
+
+    def start(
+        self,
+        qs: dict[str, Q],
+        *,
+        quiz: str,
+        category: str | None = None,
+        seconds: float = 30.0,
+        mode: Mode = "timing",
+        interval: float = 0.005,
+    ) -> dict:
+        """Start profiling a quiz or one of its categories.
+
+        Args:
+            qs: Dictionary mapping category names to Q objects of the quiz.
+            quiz: Name of the quiz, used in reports.
+            category: Only profile this category. Defaults to all of them.
+            seconds: Stop automatically after this many seconds.
+            mode: "timing", "cprofile" or "sample".
+            interval: Sampling interval in seconds for the "sample" mode.
+
+        Returns:
+            The report of the new (empty) profile.
+
+        Raises:
+            RuntimeError: If a profile is already running.
+            KeyError: If category is not part of qs.
+            ValueError: If mode or seconds is invalid.
+        """
+        if mode not in ("timing", "cprofile", "sample"):
+            raise ValueError(f"unknown profiling mode {mode!r}")
+        if seconds <= 0:
+            raise ValueError("seconds must be positive")
+        if category is not None and category not in qs:
+            raise KeyError(category)
+
+        with self._lock:
+            if self.active:
+                raise RuntimeError("a profile is already running")
+            session = _Session(quiz, category, mode, seconds, interval)
+
+            seen = set()
+            for cat, q in qs.items():
+                if category is not None and cat != category:
+                    continue
+                # The same Q may be registered under several categories
+                if id(q) in seen:
+                    continue
+                seen.add(id(q))
+                for name in CALLABLES:
+                    original = getattr(q, name)
+                    session.patched.append((q, name, original))
+                    setattr(q, name, session.wrap(cat, name, original))
+
+            if mode == "sample":
+                threading.Thread(
+                    target=session.sample, name="ezquiz-sampler", daemon=True
+                ).start()
+
+            self._session = session
+            self._timer = threading.Timer(seconds, self.stop)
+            self._timer.daemon = True
+            self._timer.start()
+
+        return self.report()
+
+    def stop(self) -> dict:
+        """Stop the running profile and restore the original functions.
+
+        Does nothing if no profile is running.
+
+        Returns:
+            The report of the last profile.
+        """
+        with self._lock:
+            session = self._session
+            if session is not None and session.stopped is None:
+                for q, name, original in session.patched:
+                    setattr(q, name, original)
+                session.sampler_stop.set()
+                session.stopped = time.time()
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+        return self.report()
+
+    def report(self) -> dict:
+        """Return the status and per-function timings of the last profile.
+
+        Timings are sorted by total wall time, slowest first.
+        """
+        session = self._session
+        if session is None:
+            return {"active": False}
+
+        with session.lock:
+            timings = [
+                {
+                    "category": category,
+                    "callable": name,
+                    "calls": calls,
+                    "wall_total": wall_total,
+                    "wall_mean": wall_total / calls,
+                    "wall_max": wall_max,
+                    "cpu_total": cpu_total,
+                }
+                for (category, name), (calls, wall_total, wall_max, cpu_total) in (
+                    session.timings.items()
+                )
+            ]
+        timings.sort(key=lambda t: t["wall_total"], reverse=True)
+
+        end = session.stopped or time.time()
+        return {
+            "active": session.stopped is None,
+            "quiz": session.quiz,
+            "category": session.category,
+            "mode": session.mode,
+            "seconds": session.seconds,
+            "elapsed": end - session.started,
+            "timings": timings,
+        }
+
+    def pstats(self) -> bytes | None:
+        """Return the cProfile data of the last profile in pstats format.
+
+        The bytes can be saved to a file and opened with `pstats.Stats`
+        or snakeviz. Returns None unless the last profile used "cprofile".
+        """
+        session = self._session
+        if session is None or session.cprofile is None:
+            return None
+        with session.cprofile_lock:
+            session.cprofile.create_stats()
+            return marshal.dumps(session.cprofile.stats)
+
+    def collapsed(self) -> str | None:
+        """Return the sampled stacks of the last profile in collapsed format.
+
+        Each line is `category;callable;frame;frame... count`, outermost
+        frame first. Returns None unless the last profile used "sample".
+        """
+        session = self._session
+        if session is None or session.mode != "sample":
+            return None
+        samples = session.samples.copy()
+        return "".join(f"{stack} {count}\n" for stack, count in samples.items())
@@ -1,26 +1,39 @@
 /**
  * API communication module
+ * Offline quizzes are served from the local bank instead of the server
  */
 
+import { state } from './state.js';
+import { sampleQuestion, gradeAnswer } from './offline.js';
+
 /**
  * Fetch the next question from the API
  * @param {string[]} categories - Selected category names
  * @returns {Promise<Object>} Question data or completion status
  */
 export async function fetchNextQuestion(categories) {
+  if (state.bank) {
+    return { complete: false, question: sampleQuestion(categories) };
+  }
+
   const response = await fetch('api/next', {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json'
     },
-    body: JSON.stringify({ categories })
+    body: JSON.stringify({ categories, session: state.session })
   });
   
   if (!response.ok) {
     throw new Error(`HTTP error! status: ${response.status}`);
   }
   
-  return response.json();
+  const data = await response.json();
+  // Timed quizzes identify the session across requests
+  if (data.session) {
+    state.setSession(data.session);
+  }
+  return data;
 }
 
 /**
@@ -28,9 +41,15 @@ export async function fetchNextQuestion(categories) {
  * @param {string} category - Question category
  * @param {*} seed - Question seed
  * @param {string} answer - User's answer
- * @returns {Promise<Object>} Result with correctness and explanation
+ * @param {string} [token] - Question token of timed quizzes
+ * @returns {Promise<Object>} Result with correctness and explanation,
+ *   or with expired set if the answer was too late
  */
-export async function submitAnswer(category, seed, answer) {
+export async function submitAnswer(category, seed, answer, token) {
+  if (state.bank) {
+    return gradeAnswer(category, seed, answer.trim());
+  }
+
   const response = await fetch('api/submit', {
     method: 'POST',
     headers: {
@@ -39,10 +58,17 @@ export async function submitAnswer(category, seed, answer) {
     body: JSON.stringify({
       category,
       seed,
-      answer: answer.trim()
+      answer: answer.trim(),
+      session: state.session,
+      token
     })
   });
   
+  if (response.status === 409) {
+    const data = await response.json();
+    return { ...data, correct: false, submitted_answer: answer.trim() };
+  }
+  
   if (!response.ok) {
     throw new Error(`HTTP error! status: ${response.status}`);
   }
@@ -7,10 +7,12 @@ import { initSetup } from './views/setup.js';
 import { initQuiz } from './views/quiz.js';
 import { initSidebar } from './views/sidebar.js';
 import { initTheme } from './theme.js';
+import { initOffline } from './offline.js';
 
 document.addEventListener('DOMContentLoaded', () => {
   initTheme();
   initSetup();
   initSidebar();
   initQuiz();
+  initOffline();
 });
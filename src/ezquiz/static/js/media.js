@@ -0,0 +1,61 @@
+/**
+ * Media module
+ * Renders question images and audio, and preloads media of upcoming questions
+ */
+
+/**
+ * Render the media of a question into a container
+ * @param {HTMLElement} container - Element to render into (hidden if no media)
+ * @param {Object[]} media - List of {type: "image" | "audio", src}
+ */
+export function renderMedia(container, media) {
+  container.replaceChildren();
+
+  if (!media || media.length === 0) {
+    container.classList.add('hidden');
+    return;
+  }
+
+  for (const item of media) {
+    let element;
+    if (item.type === 'image') {
+      element = document.createElement('img');
+      element.className = 'max-h-80 mx-auto rounded-lg';
+      element.alt = '';
+    } else if (item.type === 'audio') {
+      element = document.createElement('audio');
+      element.className = 'w-full';
+      element.controls = true;
+      element.preload = 'auto';
+    } else {
+      continue;
+    }
+    element.src = item.src;
+    container.appendChild(element);
+  }
+
+  container.classList.remove('hidden');
+}
+
+// <link rel="prefetch"> elements of the last preloaded question
+let prefetchLinks = [];
+
+/**
+ * Start downloading media into the browser cache
+ * Replaces the links added for the previous question, so only one
+ * question's worth of links is ever in the document
+ * @param {Object[]} media - List of {type, src}
+ */
+export function preloadMedia(media) {
+  for (const link of prefetchLinks) {
+    link.remove();
+  }
+
+  prefetchLinks = (media || []).map(item => {
+    const link = document.createElement('link');
+    link.rel = 'prefetch';
+    link.href = item.src;
+    document.head.appendChild(link);
+    return link;
+  });
+}
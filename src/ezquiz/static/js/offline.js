@@ -0,0 +1,148 @@
+/**
+ * Offline grading module
+ * Samples and grades questions from a bank downloaded once from the server,
+ * and syncs results back in batches
+ */
+
+import { state } from './state.js';
+import { sha256 } from './sha256.js';
+
+const SYNC_BATCH_SIZE = 20;
+
+let pendingResults = [];
+
+/**
+ * Check whether this quiz is graded client-side
+ * @returns {boolean} True if the server enabled offline mode
+ */
+export function isOfflineQuiz() {
+  return document.getElementById('setup-view').dataset.offline === 'true';
+}
+
+/**
+ * Download the question bank (cached by the browser via ETag)
+ */
+export async function loadBank() {
+  if (state.bank) {
+    return;
+  }
+
+  const response = await fetch('api/bank');
+
+  if (!response.ok) {
+    throw new Error(`HTTP error! status: ${response.status}`);
+  }
+
+  const bank = await response.json();
+  // Index answers by question text for constant-time grading
+  for (const category of Object.values(bank.categories)) {
+    category.answers = new Map(category.questions);
+  }
+  state.setBank(bank);
+}
+
+/**
+ * Pick a random question from the selected categories
+ * @param {string[]} categories - Selected category names
+ * @returns {Object} Question object in the same shape as api/next
+ */
+export function sampleQuestion(categories) {
+  const category = categories[Math.floor(Math.random() * categories.length)];
+  const bank = state.bank.categories[category];
+  const [text, , options] = bank.questions[Math.floor(Math.random() * bank.questions.length)];
+
+  return {
+    category,
+    seed: text,
+    text,
+    type: bank.type,
+    context: '',
+    hints: [],
+    options: options || []
+  };
+}
+
+/**
+ * Grade an answer locally and queue it for syncing
+ * @param {string} category - Question category
+ * @param {string} seed - Question text
+ * @param {string} answer - User's answer
+ * @returns {Object} Result in the same shape as api/submit
+ */
+export function gradeAnswer(category, seed, answer) {
+  const { salt } = state.bank;
+  const bank = state.bank.categories[category];
+  const expected = bank.answers.get(seed);
+  const normalize = s => (bank.case_sensitive ? s : s.toLowerCase());
+
+  const correct = salt === null
+    ? normalize(expected) === normalize(answer)
+    : sha256(salt + normalize(answer)) === expected;
+
+  queueResult({ category, seed, answer, correct });
+
+  if (salt !== null) {
+    // The correct answer is not known client-side, so no diff can be shown
+    return {
+      correct,
+      submitted_answer: answer,
+      correct_answer: null,
+      explanation: { type: 'text', value: 'That is not the expected answer.' }
+    };
+  }
+
+  return {
+    correct,
+    submitted_answer: answer,
+    correct_answer: expected,
+    explanation: { type: 'text_diff' }
+  };
+}
+
+/**
+ * Queue a result and sync once a full batch is collected
+ * @param {Object} result - Result with category, seed, answer and correct
+ */
+function queueResult(result) {
+  pendingResults.push(result);
+  if (pendingResults.length >= SYNC_BATCH_SIZE) {
+    flushResults();
+  }
+}
+
+/**
+ * Send all pending results to the server
+ * @param {boolean} beacon - Use sendBeacon (for page unload)
+ */
+export function flushResults(beacon = false) {
+  if (pendingResults.length === 0) {
+    return;
+  }
+
+  const body = JSON.stringify({ results: pendingResults });
+  pendingResults = [];
+
+  if (beacon) {
+    navigator.sendBeacon('api/sync', new Blob([body], { type: 'application/json' }));
+    return;
+  }
+
+  fetch('api/sync', {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json'
+    },
+    body
+  }).catch(error => console.error('Error syncing results:', error));
+}
+
+/**
+ * Initialize offline mode (flush results when the page is hidden)
+ */
+export function initOffline() {
+  if (!isOfflineQuiz()) {
+    return;
+  }
+
+  window.addEventListener('pagehide', () => flushResults(true));
+}
@@ -9,10 +9,32 @@ class State {
     this.currentQuestion = null;
     this.questionNumber = 0;
     this.showingResult = false;
+    this.bank = null;
+    this.prefetchedQuestion = null;
+    this.session = null;
+  }
+
+  setSession(session) {
+    this.session = session;
+  }
+
+  setBank(bank) {
+    this.bank = bank;
   }
 
   selectCategories(categories) {
     this.selectedCategories = [...categories];
+    this.prefetchedQuestion = null;
+  }
+
+  setPrefetched(promise) {
+    this.prefetchedQuestion = promise;
+  }
+
+  takePrefetched() {
+    const promise = this.prefetchedQuestion;
+    this.prefetchedQuestion = null;
+    return promise;
   }
 
   setQuestion(question) {
@@ -30,6 +52,8 @@ class State {
     this.currentQuestion = null;
     this.questionNumber = 0;
     this.showingResult = false;
+    this.prefetchedQuestion = null;
+    this.session = null;
   }
 }
 
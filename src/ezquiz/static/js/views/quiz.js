@@ -6,6 +6,7 @@
 import { state } from '../state.js';
 import { submitAnswer, fetchNextQuestion } from '../api.js';
 import { showResult } from './results.js';
+import { renderMedia, preloadMedia } from '../media.js';
 
 const setupView = document.getElementById('setup-view');
 const quizView = document.getElementById('quiz-view');
@@ -18,10 +19,14 @@ const questionContainer = document.getElementById('question-container');
 const resultContainer = document.getElementById('result-container');
 const contextContainer = document.getElementById('context-container');
 const questionContext = document.getElementById('question-context');
+const mediaContainer = document.getElementById('media-container');
+const questionTimer = document.getElementById('question-timer');
+
+let timerInterval = null;
 
 /**
  * Display the quiz interface with current question
- * Supports both "simple" and "fill" question types
+ * Supports "simple", "fill" and "choice" question types
  */
 export function showQuiz() {
   setupView.classList.add('hidden');
@@ -47,11 +52,89 @@ export function showQuiz() {
     questionContext.textContent = '';
   }
   
+  renderMedia(mediaContainer, question.media);
+  startTimer(question.time_limit);
+  
   if (question.type === 'fill') {
     renderFillQuestion(question);
+  } else if (question.type === 'choice') {
+    renderChoiceQuestion(question);
   } else {
     renderSimpleQuestion(question);
   }
+  
+  prefetchNextQuestion();
+}
+
+/**
+ * Show a countdown for timed questions
+ * The limit is enforced by the server; this is only a display
+ * @param {number|null|undefined} seconds - Seconds left to answer
+ */
+function startTimer(seconds) {
+  stopTimer();
+  
+  if (seconds === null || seconds === undefined) {
+    questionTimer.classList.add('hidden');
+    return;
+  }
+  
+  const deadline = performance.now() + seconds * 1000;
+  const update = () => {
+    const left = (deadline - performance.now()) / 1000;
+    if (left > 0) {
+      questionTimer.textContent = `⏱ ${Math.ceil(left)}s`;
+    } else {
+      questionTimer.textContent = "⏱ Time's up";
+      stopTimer();
+    }
+  };
+  
+  update();
+  timerInterval = setInterval(update, 250);
+  questionTimer.classList.remove('hidden');
+}
+
+/**
+ * Stop the countdown, leaving the last value displayed
+ */
+function stopTimer() {
+  if (timerInterval !== null) {
+    clearInterval(timerInterval);
+    timerInterval = null;
+  }
+}
+
+/**
+ * Fetch the next question in the background and start loading its media
+ * Only enabled for quizzes added with prefetch=True
+ */
+function prefetchNextQuestion() {
+  if (setupView.dataset.prefetch !== 'true') {
+    return;
+  }
+  
+  const promise = fetchNextQuestion(state.selectedCategories);
+  promise
+    .then(data => {
+      if (!data.complete) {
+        preloadMedia(data.question.media);
+      }
+    })
+    .catch(() => {});
+  state.setPrefetched(promise);
+}
+
+/**
+ * Get the next question, using the prefetched one if available
+ * @returns {Promise<Object>} Question data or completion status
+ */
+function nextQuestion() {
+  const prefetched = state.takePrefetched();
+  if (prefetched) {
+    return prefetched.catch(() => fetchNextQuestion(state.selectedCategories));
+  }
+  return fetchNextQuestion(state.selectedCategories);
 }
 
 /**
@@ -101,6 +184,32 @@ function renderFillQuestion(question) {
   }
 }
 
+/**
+ * Render a multiple choice question with one radio button per option
+ * Options can also be picked with the number keys
+ * @param {Object} question - Question object with text and options
+ */
+function renderChoiceQuestion(question) {
+  if (!question.options || question.options.length === 0) {
+    renderSimpleQuestion(question);
+    return;
+  }
+
+  const options = question.options.map((option, i) => `
+    <label class="flex items-center space-x-3 p-3 border dark:border-gray-600 rounded-lg hover:bg-gray-50 dark:hover:bg-gray-700 cursor-pointer transition">
+      <input type="radio" name="choice-option" value="${i}"
+             class="w-5 h-5 text-blue-600 focus:ring-blue-500 dark:bg-gray-700 dark:border-gray-600">
+      <span class="text-sm text-gray-400 dark:text-gray-500">${i + 1}</span>
+      <span class="text-gray-800 dark:text-gray-100">${escapeHtml(option)}</span>
+    </label>
+  `).join('');
+
+  questionContainer.innerHTML = `
+    <p id="question-text" class="text-xl text-gray-800 dark:text-gray-100 mb-4">${escapeHtml(question.text)}</p>
+    <div id="choice-options" class="space-y-2">${options}</div>
+  `;
+}
+
 /**
  * Escape HTML special characters
  * @param {string} text - Text to escape
@@ -117,6 +226,10 @@ function escapeHtml(text) {
  * @returns {string} The answer value
  */
 function getAnswer() {
+  const selected = document.querySelector('input[name="choice-option"]:checked');
+  if (selected) {
+    return state.currentQuestion.options[Number(selected.value)];
+  }
   const input = document.getElementById('answer-input');
   return input ? input.value : '';
 }
@@ -128,10 +241,10 @@ async function handleSubmit() {
   if (state.showingResult) {
     // Get next question
     try {
-      const data = await fetchNextQuestion(state.selectedCategories);
+      const data = await nextQuestion();
       
       if (data.complete) {
-        alert('Quiz complete! Great job!');
+        alert(data.expired ? "Time's up! The quiz session is over." : 'Quiz complete! Great job!');
         import('./setup.js').then(({ resetSetup }) => resetSetup());
         return;
       }
@@ -151,9 +264,11 @@ async function handleSubmit() {
     const data = await submitAnswer(
       state.currentQuestion.category,
       state.currentQuestion.seed,
-      answer
+      answer,
+      state.currentQuestion.token
     );
     
+    stopTimer();
     state.markShowingResult();
     showResult(data);
   } catch (error) {
@@ -177,4 +292,16 @@ export function initQuiz() {
       handleSubmit();
     }
   });
+
+  // Number keys select multiple choice options
+  document.addEventListener('keydown', (e) => {
+    if (quizView.classList.contains('hidden') || state.showingResult) {
+      return;
+    }
+    const radios = document.querySelectorAll('input[name="choice-option"]');
+    const index = parseInt(e.key, 10) - 1;
+    if (index >= 0 && index < radios.length) {
+      radios[index].checked = true;
+    }
+  });
 }
@@ -32,7 +32,9 @@ export function showResult(data) {
   
   let explanationHtml = '';
   
-  if (!isCorrect && data.explanation) {
+  if (data.expired) {
+    explanationHtml = `<div class="bg-red-100 dark:bg-red-900/30 border-l-4 border-red-500 dark:border-red-600 p-4"><p class="font-bold text-red-800 dark:text-red-300 text-lg">⏱ Time's up!</p><p class="text-gray-600 dark:text-gray-400 mt-1">Your answer was not graded (${data.detail}).</p></div>`;
+  } else if (!isCorrect && data.explanation) {
     const exp = data.explanation;
     
     if (exp.type === "text_diff") {
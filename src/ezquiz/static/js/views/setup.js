@@ -6,6 +6,7 @@
 import { state } from '../state.js';
 import { showQuiz } from './quiz.js';
 import { fetchNextQuestion } from '../api.js';
+import { isOfflineQuiz, loadBank } from '../offline.js';
 
 const setupView = document.getElementById('setup-view');
 const startBtn = document.getElementById('start-btn');
@@ -34,6 +35,10 @@ function syncSidebarCategories() {
  */
 async function loadFirstQuestion() {
   try {
+    if (isOfflineQuiz()) {
+      await loadBank();
+    }
+
     const data = await fetchNextQuestion(state.selectedCategories);
     
     if (data.complete) {
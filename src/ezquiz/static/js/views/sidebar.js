@@ -35,7 +35,7 @@ async function handleUpdateCategories() {
     const data = await fetchNextQuestion(state.selectedCategories);
     
     if (data.complete) {
-      alert('Quiz complete! Great job!');
+      alert(data.expired ? "Time's up! The quiz session is over." : 'Quiz complete! Great job!');
       const { resetSetup } = await import('./setup.js');
       resetSetup();
       return;
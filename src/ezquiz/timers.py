@@ -0,0 +1,292 @@
+"""Deadlines for timed quizzes.
+
+TimedSessions keeps the state of timed quiz sessions: the session deadline
+and the deadline of the question currently being answered. All deadlines
+are taken from the monotonic clock on the server. A late submit is rejected
+with a dictionary lookup and a comparison, before anything is graded.
+
+Sessions are evicted once they expire, or after a period of inactivity.
+Eviction is driven by a hierarchical TimerWheel that is advanced on every
+request. There is no task per session and no scan over all sessions, so
+scheduling, rescheduling and expiring a session all cost O(1) amortized.
+
+Example:
+    >>> sessions = TimedSessions(time_limit=20, session_limit=300)
+    >>> session_id, token, remaining = sessions.next_question(None, "q1")
+    >>> sessions.check_submit(session_id, token, "q1")  # None means accepted
+"""
+
+import math
+import secrets
+import time
+from typing import Callable, Hashable
+
+
+class TimerWheel:
+    """Hierarchical timing wheel.
+
+    Level 0 has `slots` buckets of `resolution` seconds each. Every further
+    level covers `slots` times the span of the level below. A timer is
+    stored at the lowest level whose span covers it, and moves down a level
+    each time the wheel below wraps around, until it expires from level 0.
+    Timers beyond the span of the top level wait there and are re-filed
+    when they come around.
+
+    Timers fire at most one `resolution` late and never early.
+
+    Example:
+        >>> wheel = TimerWheel(resolution=0.1, now=0.0)
+        >>> wheel.schedule("a", 1.0)
+        >>> wheel.schedule("b", 2.5)
+        >>> wheel.advance(1.2)
+        ['a']
+    """
+
+    def __init__(
+        self,
+        resolution: float = 0.1,
+        slots: int = 64,
+        levels: int = 4,
+        now: float | None = None,
+    ) -> None:
+        """Initialize an empty wheel.
+
+        Args:
+            resolution: Length of a level 0 tick, in seconds.
+            slots: Number of slots per level.
+            levels: Number of levels. With the defaults, timers up to
+                    0.1 * 64**4 seconds (about 19 days) are filed directly.
+            now: Current time of the clock deadlines are measured on.
+                 Defaults to `time.monotonic()`.
+        """
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self._wheels: list[list[dict[Hashable, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._where: dict[Hashable, tuple[int, int]] = {}  # key -> (level, slot)
+        self._tick = int((time.monotonic() if now is None else now) / resolution)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """Schedule a timer, replacing any timer with the same key.
+
+        Args:
+            key: Identifies the timer; returned by `advance` when it expires.
+            deadline: Expiry time, on the same clock as `advance`.
+        """
+        self.cancel(key)
+        self._insert(key, math.ceil(deadline / self.resolution), self._tick + 1)
+
+    def cancel(self, key: Hashable) -> None:
+        """Remove a timer. Does nothing if it is not scheduled."""
+        location = self._where.pop(key, None)
+        if location is not None:
+            level, slot = location
+            del self._wheels[level][slot][key]
+
+    def _insert(self, key: Hashable, tick: int, earliest: int) -> None:
+        """File a timer expiring at tick, but not before tick earliest."""
+        place = max(tick, earliest)
+        delta = place - self._tick
+        level = 0
+        span = self.slots
+        while delta >= span and level < self.levels - 1:
+            level += 1
+            span *= self.slots
+        if delta >= span:
+            # Beyond the top level: park it in the last slot in range
+            place = self._tick + span - 1
+        slot = (place // (span // self.slots)) % self.slots
+        self._wheels[level][slot][key] = tick
+        self._where[key] = (level, slot)
+
+    def _cascade(self, level: int) -> None:
+        """Move the timers of the current slot of a level one level down."""
+        span = self.slots**level
+        slot = (self._tick // span) % self.slots
+        timers = self._wheels[level][slot]
+        self._wheels[level][slot] = {}
+        for key, tick in timers.items():
+            del self._where[key]
+            self._insert(key, tick, self._tick)
+
+    def advance(self, now: float | None = None) -> list[Hashable]:
+        """Move the wheel forward and collect the expired timers.
+
+        Args:
+            now: Current time. Defaults to `time.monotonic()`.
+
+        Returns:
+            Keys of the timers that expired, which are removed from the wheel.
+        """
+        target = int((time.monotonic() if now is None else now) / self.resolution)
+        expired = []
+        while self._tick < target:
+            if not self._where:
+                self._tick = target
+                break
+            self._tick += 1
+
+            # When a level wraps around, refill it from the level above
+            wrapped = 0
+            while (
+                wrapped + 1 < self.levels
+                and self._tick % (self.slots ** (wrapped + 1)) == 0
+            ):
+                wrapped += 1
+            for level in range(wrapped, 0, -1):
+                self._cascade(level)
+
+            slot = self._tick % self.slots
+            timers = self._wheels[0][slot]
+            self._wheels[0][slot] = {}
+            for key, tick in timers.items():
+                del self._where[key]
+                if tick <= self._tick:
+                    expired.append(key)
+                else:  # Parked beyond the top level, file it again
+                    self._insert(key, tick, self._tick + 1)
+        return expired
+
+
+class _TimedSession:
+    """State of one timed session."""
+
+    __slots__ = ("deadline", "token", "question", "question_deadline")
+
+    def __init__(self, deadline: float | None) -> None:
+        self.deadline = deadline
+        self.token: str | None = None
+        self.question: Hashable = None
+        self.question_deadline: float | None = None
+
+
+class TimedSessions:
+    """Per-question and per-session time limits for one quiz.
+
+    Not thread-safe. It is only used from the event loop of the server.
+    """
+
+    def __init__(
+        self,
+        time_limit: float | None = None,
+        session_limit: float | None = None,
+        idle_timeout: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty session store.
+
+        Args:
+            time_limit: Seconds allowed per question.
+            session_limit: Seconds allowed per session.
+            idle_timeout: Seconds after the last question's deadline (or
+                    issue, without a time limit) after which an inactive
+                    session is evicted.
+            clock: Monotonic clock returning seconds.
+        """
+        self.time_limit = time_limit
+        self.session_limit = session_limit
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self._sessions: dict[str, _TimedSession] = {}
+        self._wheel = TimerWheel(now=clock())
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict(self, now: float) -> None:
+        for session_id in self._wheel.advance(now):
+            del self._sessions[session_id]
+
+    def next_question(self, session_id: str | None, question: Hashable) -> tuple | None:
+        """Issue a question, starting a new session if needed.
+
+        Any question of the session that is still open is discarded.
+
+        Args:
+            session_id: Session of the client, or None to start one.
+            question: Identifies the question being issued. Only an answer
+                    to this question is accepted with the returned token.
+
+        Returns:
+            (session_id, token, remaining) where token must be sent with
+            the answer and remaining is the seconds left to answer, or None
+            if there is no limit. Returns None if the session is over.
+        """
+        now = self.clock()
+        self._evict(now)
+
+        if session_id is None:
+            session_id = secrets.token_urlsafe(12)
+            deadline = None
+            if self.session_limit is not None:
+                deadline = now + self.session_limit
+            session = self._sessions[session_id] = _TimedSession(deadline)
+        else:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if session.deadline is not None and now >= session.deadline:
+                self._wheel.cancel(session_id)
+                del self._sessions[session_id]
+                return None
+
+        deadlines = [
+            d
+            for d in (
+                session.deadline,
+                None if self.time_limit is None else now + self.time_limit,
+            )
+            if d is not None
+        ]
+        session.token = secrets.token_urlsafe(8)
+        session.question = question
+        session.question_deadline = min(deadlines) if deadlines else None
+
+        evict_at = (session.question_deadline or now) + self.idle_timeout
+        if session.deadline is not None:
+            evict_at = min(evict_at, session.deadline)
+        self._wheel.schedule(session_id, evict_at)
+
+        remaining = None
+        if session.question_deadline is not None:
+            remaining = session.question_deadline - now
+        return session_id, session.token, remaining
+
+    def check_submit(
+        self, session_id: str | None, token: str | None, question: Hashable
+    ) -> str | None:
+        """Accept or reject an answer. Each question can be answered once.
+
+        Args:
+            session_id: Session the answer belongs to.
+            token: Token of the question being answered.
+            question: Identifies the question being answered, as passed to
+                    `next_question`.
+
+        Returns:
+            None if the answer is on time, otherwise the reason it was
+            rejected.
+        """
+        now = self.clock()
+        self._evict(now)
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            return "session expired"
+        if token is None or session.token != token:
+            return "question is no longer open"
+        if session.question != question:
+            return "token was issued for another question"
+        session.token = None
+        session.question = None
+        if session.question_deadline is not None and now > session.question_deadline:
+            return "time limit exceeded"
+        return None
@@ -0,0 +1,132 @@
+"""
+Test to verify that bulk grading bodies are parsed the same way whatever the
+chunk boundaries are, for JSON Lines and JSON array bodies.
+Run with `python tests/bulk_parsing_test.py`.
+"""
+
+import asyncio
+
+from ezquiz import Q
+from ezquiz.grading import agrade_many, iter_json_rows
+
+
+def parse(body: bytes, chunk_size: int) -> list:
+    async def chunks():
+        for i in range(0, len(body), chunk_size):
+            yield body[i : i + chunk_size]
+
+    async def collect():
+        return [row async for row in iter_json_rows(chunks())]
+
+    return asyncio.run(collect())
+
+
+def check(body: bytes, expected: list):
+    for chunk_size in range(1, len(body) + 1):
+        rows = parse(body, chunk_size)
+        assert rows == expected, (chunk_size, rows)
+
+
+def test_json_lines_with_array_rows():
+    check(
+        b'["c","a?","a"]\n["c","b?","b"]\n',
+        [["c", "a?", "a"], ["c", "b?", "b"]],
+    )
+
+
+def test_numbers_split_across_chunks():
+    check(b'["c",12345,"a"]', [["c", 12345, "a"]])
+    check(
+        b'[{"category":"c","seed":12345,"answer":"a"}]',
+        [{"category": "c", "seed": 12345, "answer": "a"}],
+    )
+    check(b'[["c",1,"a"], 12345]', [["c", 1, "a"], 12345])
+
+
+def test_json_array_and_object_lines():
+    check(b'[["c","a?","a"], ["c","b?","b"]]', [["c", "a?", "a"], ["c", "b?", "b"]])
+    check(b'{"category":"c"}\n{"category":"d"}', [{"category": "c"}, {"category": "d"}])
+    check(b"[]", [])
+
+
+def grade_body(body: bytes, chunk_size: int) -> tuple[list, str | None]:
+    """Grade a body the way /api/grade_bulk does."""
+    qs = {"nums": Q.from_dict({"2+2": "4", "1+2": "3"})}
+
+    async def chunks():
+        for i in range(0, len(body), chunk_size):
+            yield body[i : i + chunk_size]
+
+    async def collect():
+        results = []
+        try:
+            async for result in agrade_many(qs, iter_json_rows(chunks())):
+                results.append(result)
+        except ValueError as e:
+            return results, str(e)
+        return results, None
+
+    return asyncio.run(collect())
+
+
+def test_malformed_row_in_the_middle():
+    body = b'["nums","2+2","4"]\n["nums","1+2","3"]\n{bad json}\n["nums","1+2","0"]\n'
+    for chunk_size in (1, 7, len(body)):
+        results, error = grade_body(body, chunk_size)
+        results.sort(key=lambda r: r["index"])
+        assert error is None, error
+        assert [r.get("correct") for r in results] == [True, True, None, False]
+        assert "invalid JSON" in results[2]["error"]
+
+
+def test_broken_array_grades_rows_before_it():
+    body = b'[["nums","2+2","4"], ["nums","1+2","3"] oops]'
+    results, error = grade_body(body, 5)
+    assert sorted(r["index"] for r in results) == [0, 1], results
+    assert error is not None
+
+
+def grade_body(body: bytes, chunk_size: int) -> tuple[list, str | None]:
+    """Grade a body the way /api/grade_bulk does."""
+    qs = {"nums": Q.from_dict({"2+2": "4", "1+2": "3"})}
+
+    async def chunks():
+        for i in range(0, len(body), chunk_size):
+            yield body[i : i + chunk_size]
+
+    async def collect():
+        results = []
+        try:
+            async for result in agrade_many(qs, iter_json_rows(chunks())):
+                results.append(result)
+        except ValueError as e:
+            return results, str(e)
+        return results, None
+
+    return asyncio.run(collect())
+
+
+def test_malformed_row_in_the_middle():
+    body = b'["nums","2+2","4"]\n["nums","1+2","3"]\n{bad json}\n["nums","1+2","0"]\n'
+    for chunk_size in (1, 7, len(body)):
+        results, error = grade_body(body, chunk_size)
+        results.sort(key=lambda r: r["index"])
+        assert error is None, error
+        assert [r.get("correct") for r in results] == [True, True, None, False]
+        assert "invalid JSON" in results[2]["error"]
+
+
+def test_broken_array_grades_rows_before_it():
+    body = b'[["nums","2+2","4"], ["nums","1+2","3"] oops]'
+    results, error = grade_body(body, 5)
+    assert sorted(r["index"] for r in results) == [0, 1], results
+    assert error is not None
+
+
+if __name__ == "__main__":
+    test_json_lines_with_array_rows()
+    test_numbers_split_across_chunks()
+    test_json_array_and_object_lines()
+    test_malformed_row_in_the_middle()
+    test_broken_array_grades_rows_before_it()
+    print("ok")
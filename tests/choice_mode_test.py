@@ -0,0 +1,45 @@
+"""
+Test to verify multiple choice questions, generated from a bank and custom.
+Each question should show the same options in the same order every time it appears.
+"""
+
+from random import randint
+
+from ezquiz import APIGame, Q
+
+capitals = Q.from_dict(
+    {
+        "What is the capital of France?": "Paris",
+        "What is the capital of Peru?": "Lima",
+        "What is the capital of Japan?": "Tokyo",
+        "What is the capital of Italy?": "Rome",
+        "What is the capital of Norway?": "Oslo",
+        "What is the capital of Portugal?": "Lisbon",
+    },
+    question_type="choice",
+)
+
+# Custom options from ask
+AddChoiceQ = Q[tuple[int, int]](
+    get_seed=lambda: (randint(1, 10), randint(1, 10)),
+    ask=lambda t: {
+        "text": f"What is {t[0]} + {t[1]}?",
+        "type": "choice",
+        "options": [str(t[0] + t[1] + d) for d in (-1, 0, 1)],
+    },
+    correct=lambda t: str(t[0] + t[1]),
+)
+
+game = APIGame()
+
+game.add_quiz(
+    "choice",
+    "Multiple Choice Test",
+    {
+        "capitals": capitals,
+        "addition": AddChoiceQ,
+    },
+)
+
+if __name__ == "__main__":
+    game.start(host="localhost", port=8003)
@@ -0,0 +1,45 @@
+"""
+Test to verify that static banks can be downloaded and graded client-side.
+Open the quiz, answer a few questions and check the server log for synced batches.
+"""
+
+from ezquiz import APIGame, Q
+
+capitals = Q.from_dict(
+    {
+        "What is the capital of France?": "Paris",
+        "What is the capital of Japan?": "Tokyo",
+        "What is the capital of Brazil?": "Brasília",
+    },
+)
+
+elements = Q.from_dict(
+    {
+        "The chemical symbol for gold is [...].": "Au",
+        "The chemical symbol for iron is [...].": "Fe",
+    },
+    question_type="fill",
+    case_sensitive=True,
+)
+
+game = APIGame()
+
+# Answers are hashed: incorrect answers are shown without a diff
+game.add_quiz(
+    "hashed",
+    "Offline (hashed answers)",
+    {"capitals": capitals, "elements": elements},
+    offline=True,
+)
+
+# Plain answers: the diff view works as with server-side grading
+game.add_quiz(
+    "plain",
+    "Offline (plain answers)",
+    {"capitals": capitals, "elements": elements},
+    offline=True,
+    hash_answers=False,
+)
+
+if __name__ == "__main__":
+    game.start(host="localhost", port=8002)
@@ -0,0 +1,28 @@
+"""
+Test to verify timed quizzes.
+Each question should show a countdown; answers submitted after it reaches zero
+should be rejected, and the quiz should end after one minute.
+"""
+
+from random import randint
+
+from ezquiz import APIGame, Q
+
+AddQ = Q[tuple[int, int]](
+    get_seed=lambda: (randint(10, 99), randint(10, 99)),
+    ask=lambda t: {"text": f"What is {t[0]} + {t[1]}?", "type": "simple"},
+    correct=lambda t: str(t[0] + t[1]),
+)
+
+game = APIGame()
+
+game.add_quiz(
+    "timed",
+    "Timed Addition",
+    {"addition": AddQ},
+    time_limit=10,
+    session_limit=60,
+)
+
+if __name__ == "__main__":
+    game.start(host="localhost", port=8004)